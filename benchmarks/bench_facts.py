@@ -0,0 +1,74 @@
+# benchmarks/bench_facts.py
+"""
+Micro-benchmark: the local fact router (src/facts.py) against the fake API.
+
+Checks which questions are answered locally (fact lookups) and which are
+left to the model, and compares the time per answer of the local path with
+a full ask_agent call served by FakeMistral (its default latency stands in
+for a mistral-medium round trip).
+
+Usage:
+    python benchmarks/bench_facts.py [--repeat 1000] [--latency 0.5]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+# (question, answer language, expected to be answered locally)
+QUESTIONS = [
+    ("What is your email address?", "en", True),
+    ("What languages do you speak?", "en", True),
+    ("Quelles langues parlez-vous ?", "fr", True),
+    ("What are your main skills?", "en", True),
+    ("Quelle est votre formation ?", "fr", True),
+    ("How can I contact you?", "en", True),
+    ("Where are you based?", "en", True),
+    ("What skills do you have in machine learning?", "en", False),
+    ("How did you use Python at IFM?", "en", False),
+    ("Would you be a good candidate for a BI lead role?", "en", False),
+    ("What languages do you code in?", "en", False),
+    ("Do you have Java skills?", "en", False),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake time to first token (s)")
+    args = parser.parse_args()
+
+    os.environ["MISTRAL_FAKE"] = "1"
+    os.environ["FAKE_LATENCY"] = str(args.latency)
+    os.environ["RESPONSE_CACHE"] = "0"
+    os.environ["SEMANTIC_CACHE"] = "0"
+    os.environ["ANSWER_STORE"] = "0"
+    from src.agent import ask_agent
+    from src.facts import fact_answer
+    from src.profile_loader import get_client
+
+    correct = sum((fact_answer(q, lang) is not None) == local for q, lang, local in QUESTIONS)
+    print(f"correct routing: {correct}/{len(QUESTIONS)}")
+
+    local = [(q, lang) for q, lang, is_local in QUESTIONS if is_local]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for question, lang in local:
+            ask_agent(question, lang=lang)
+    local_us = (time.perf_counter() - start) / (args.repeat * len(local)) * 1e6
+
+    calls = get_client().calls
+    start = time.perf_counter()
+    ask_agent("How did you use Python at IFM?", lang="en")
+    model_ms = (time.perf_counter() - start) * 1e3
+    print(f"local fact answer : {local_us:10.1f} us/answer (API calls: {calls})")
+    print(f"model answer      : {model_ms:10.1f} ms/answer (fake API, {args.latency}s latency)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_import.py
+"""
+Cold-start benchmark: wall time of a fresh interpreter importing the package.
+
+Compares
+- `import src.utils`        : tooling that only needs helpers
+- `import src`              : lazy package import (what Streamlit pays on start)
+- `import src; src.init()`  : eager profile + client build (the old import-time cost)
+
+Usage:
+    python benchmarks/bench_import.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CASES = {
+    "import src.utils": "import src.utils",
+    "import src": "import src",
+    "import src; src.init()": "import src; src.init()",
+}
+
+
+def time_command(code: str, runs: int) -> list:
+    env = dict(os.environ, MISTRAL_API_KEY=os.environ.get("MISTRAL_API_KEY", "benchmark"))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_command("pass", args.runs))
+    print(f"{'case':<28}{'median ms':>12}{'min ms':>10}{'over bare python':>18}")
+    for label, code in CASES.items():
+        timings = time_command(code, args.runs)
+        median = statistics.median(timings)
+        print(f"{label:<28}{median:>12.1f}{min(timings):>10.1f}{median - baseline:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_language.py
+"""
+Micro-benchmark: src.language.detect_language vs the previous langdetect path.
+
+Inputs are the profile's sample questions (EN and FR) plus a long pasted
+job description. Reports per-call latency (first call, uncached and cached)
+and agreement between the two detectors.
+
+Usage:
+    python benchmarks/bench_language.py [--repeat 200]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.language import _detect, detect_language  # noqa: E402
+from src.profile_loader import get_profile  # noqa: E402
+
+JOB_DESCRIPTION = (
+    "Nous recherchons un Data Scientist confirmé pour rejoindre notre équipe. "
+    "Missions : construire des modèles prédictifs, automatiser les reportings, "
+    "collaborer avec les équipes commerciales. Compétences : Python, SQL, Power BI. "
+) * 60
+
+
+def load_samples() -> list:
+    samples = []
+    for item in get_profile().get("sample_questions", []):
+        for lang in ("en", "fr"):
+            if item.get(f"question_{lang}"):
+                samples.append((item[f"question_{lang}"], lang))
+    samples += [
+        ("Can you describe your experience with Power BI and DAX?", "en"),
+        ("Quelles sont vos compétences en apprentissage automatique ?", "fr"),
+        (JOB_DESCRIPTION, "fr"),
+    ]
+    return samples
+
+
+def time_per_call(fn, texts: list, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    samples = load_samples()
+    texts = [text for text, _ in samples]
+
+    def uncached(text):
+        _detect.cache_clear()
+        return detect_language(text)
+
+    start = time.perf_counter()
+    detect_language(texts[0])
+    first_call = (time.perf_counter() - start) * 1e3
+    results = {
+        "detect_language (uncached)": time_per_call(uncached, texts, args.repeat),
+        "detect_language (cached)": time_per_call(detect_language, texts, args.repeat),
+    }
+    correct = sum(detect_language(text) == lang for text, lang in samples)
+    print(f"detect_language: first call {first_call:.2f} ms, {correct}/{len(samples)} correct")
+
+    try:
+        from langdetect import DetectorFactory, detect
+    except ImportError:
+        print("langdetect not installed (pip install -e '.[dev]'): skipping comparison")
+    else:
+        DetectorFactory.seed = 0
+        start = time.perf_counter()
+        detect(texts[0])
+        first_call = (time.perf_counter() - start) * 1e3
+        results["langdetect.detect (seeded)"] = time_per_call(detect, texts, max(1, args.repeat // 20))
+        correct = sum(detect(text) == lang for text, lang in samples)
+        print(f"langdetect:      first call {first_call:.2f} ms, {correct}/{len(samples)} correct")
+
+    print(f"\n{'detector':<30}{'us/call':>12}")
+    for label, micros in results.items():
+        print(f"{label:<30}{micros:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/bench_load.py
+"""
+Offline end-to-end load benchmark for ask_agent -> query_model.
+
+Runs N concurrent sessions (threads) against the FakeMistral client, each
+asking a sequence of questions, and reports latency percentiles, throughput,
+429s and failures. No API key or network access is needed.
+
+Usage:
+    python benchmarks/bench_load.py --sessions 20 --requests 5
+    python benchmarks/bench_load.py --sessions 50 --error-rate 0.1 --unique
+    python benchmarks/bench_load.py --sessions 50 --quota 5 --backoff 0.5
+
+The response cache and the near-duplicate index are disabled unless --cache
+is given, so every request reaches the (fake) API; --unique makes every question distinct, which also
+defeats request coalescing.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent sessions")
+    parser.add_argument("--requests", type=int, default=5, help="questions per session")
+    parser.add_argument("--mode", choices=["short", "long"], default="short")
+    parser.add_argument("--unique", action="store_true", help="make every question distinct")
+    parser.add_argument("--cache", action="store_true", help="keep the response caches enabled")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake time to first token (s)")
+    parser.add_argument("--tps", type=float, default=200.0, help="fake tokens per second")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of an injected 429")
+    parser.add_argument("--quota", type=float, default=0.0, help="fake API requests/second (0 = unlimited)")
+    parser.add_argument("--backoff", type=float, default=None, help="override the retry base backoff (s)")
+    parser.add_argument("--rpm", type=float, default=600, help="client rate limiter requests/min")
+    parser.add_argument("--concurrency", type=int, default=8, help="client rate limiter concurrency")
+    parser.add_argument("--queue", type=int, default=1000, help="client rate limiter queue size")
+    return parser.parse_args()
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def main():
+    args = parse_args()
+
+    # Configure before importing src: these are read at import time
+    os.environ["MISTRAL_FAKE"] = "1"
+    if not args.cache:
+        os.environ["RESPONSE_CACHE"] = "0"
+        os.environ["SEMANTIC_CACHE"] = "0"
+    os.environ["MISTRAL_REQUESTS_PER_MINUTE"] = str(args.rpm)
+    os.environ["MISTRAL_MAX_CONCURRENCY"] = str(args.concurrency)
+    os.environ["MISTRAL_MAX_QUEUE"] = str(args.queue)
+
+    import src
+    from src import retry
+    from src.fake_client import FakeMistral
+    from src.profile_loader import get_profile
+
+    if args.backoff is not None:
+        retry.BACKOFF = args.backoff
+    fake = FakeMistral(latency=args.latency, tokens_per_second=args.tps,
+                       error_rate=args.error_rate, requests_per_second=args.quota)
+    src.init(client=fake)
+
+    questions = [
+        item[key]
+        for item in get_profile().get("sample_questions", [])
+        for key in ("question_en", "question_fr") if item.get(key)
+    ]
+
+    latencies, failures = [], []
+    lock = threading.Lock()
+
+    def session(session_id: int):
+        for i in range(args.requests):
+            question = questions[(session_id + i) % len(questions)]
+            if args.unique:
+                question = f"{question} (session {session_id}, question {i})"
+            start = time.perf_counter()
+            try:
+                src.ask_agent(question, mode=args.mode)
+            except RuntimeError as e:
+                with lock:
+                    failures.append(type(e).__name__)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(args.sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = args.sessions * args.requests
+    print(f"sessions={args.sessions} requests/session={args.requests} mode={args.mode} "
+          f"unique={args.unique} cache={args.cache}")
+    print(f"completed      {len(latencies)}/{total}  in {elapsed:.2f}s")
+    print(f"throughput     {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"latency p50    {percentile(latencies, 50) * 1000:.0f} ms")
+        print(f"latency p95    {percentile(latencies, 95) * 1000:.0f} ms")
+        print(f"latency p99    {percentile(latencies, 99) * 1000:.0f} ms")
+        print(f"latency mean   {statistics.mean(latencies) * 1000:.0f} ms")
+    print(f"upstream calls {fake.calls}")
+    print(f"429 responses  {fake.rate_limited} (retried: {fake.rate_limited - failures.count('RuntimeError')})")
+    print(f"failures       {len(failures)} {dict((f, failures.count(f)) for f in set(failures))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,32 @@ Contains:
 - agent.py       : main agent logic
 - llm_wrapper.py : Mistral API interface and profile enforcement
 - utils.py       : helper functions
-- profile_loader.py : singleton loader for profile & API client
+- profile_loader.py : lazy loader for profile & API client
 """
 
-# Optional: you can expose key functions at the package level
-from .agent import ask_agent
-from .llm_wrapper import query_model
-from .profile_loader import PROFILE_DATA, PROFILE_CONTEXT, client
+# Key functions exposed at the package level, imported on first access (PEP 562)
+# so that `import src` (or `import src.utils`) stays cheap.
+_EXPORTS = {
+    "ask_agent": "agent",
+    "ask_agent_stream": "agent",
+    "aask_agent": "agent",
+    "aask_agent_stream": "agent",
+    "query_model": "llm_wrapper",
+    "query_model_stream": "llm_wrapper",
+    "aquery_model": "llm_wrapper",
+    "aquery_model_stream": "llm_wrapper",
+    "PROFILE_DATA": "profile_loader",
+    "PROFILE_CONTEXT": "profile_loader",
+    "client": "profile_loader",
+    "init": "profile_loader",
+    "reset": "profile_loader",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
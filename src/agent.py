@@ -1,31 +1,76 @@
 # src/agent.py
-from langdetect import detect
-from src.profile_loader import PROFILE_DATA
-from src.llm_wrapper import query_model
+from typing import AsyncIterator, Iterator, Optional, Sequence
+from src.language import detect_language
+from src.memory import ConversationMemory
+from src.llm_wrapper import query_model, query_model_stream, aquery_model, aquery_model_stream
+from src.rate_limiter import PRIORITY_INTERACTIVE
+from src.instrumentation import span
 
-def ask_agent(question: str, mode: str = "short") -> str:
+def ask_agent(question: str, mode: str = "short", lang: Optional[str] = None,
+              memory: Optional[ConversationMemory] = None, priority: int = PRIORITY_INTERACTIVE,
+              profile_id: Optional[str] = None, profile_keys: Optional[Sequence[str]] = None,
+              max_tokens: Optional[int] = None) -> str:
     """
-    Ask Julien Vaughan's AI agent a question.
-    - Uses centralized profile from PROFILE_DATA.
+    Ask a candidate's AI agent a question.
+    - Uses the profile `profile_id` from the shared ProfileRegistry
+      (the default profile, data/profile.json, when omitted).
     - Supports 'short' or 'long' response modes.
-    - Automatically adapts response style based on detected language.
+    - Answers in `lang` (UI language, e.g. "Français", or "en"/"fr") when given,
+      otherwise in the detected language of the question, with the profile's
+      response style for that language.
+    - `memory` (ConversationMemory) gives the model the earlier turns of the session.
+    - `priority` orders the request in the shared API queue (see src/rate_limiter.py).
+    - `profile_keys` and `max_tokens` pick the profile fields sent and the answer
+      length instead of retrieval and the mode (e.g. one section of the CV).
     """
-    # Detect language
-    try:
-        lang = detect(question)
-    except Exception:
-        lang = "en"  # default to English if detection fails
+    with span("request", mode=mode):
+        with span("language_detection"):
+            lang = detect_language(question, lang)
+        return query_model(question, mode=mode, lang=lang, memory=memory, priority=priority,
+                           profile_id=profile_id, profile_keys=profile_keys, max_tokens=max_tokens)
 
-    # Get response style from profile
-    response_style = PROFILE_DATA.get("response_style", {}).get(lang, PROFILE_DATA.get("response_style", {}).get("en", ""))
+def ask_agent_stream(question: str, mode: str = "short", lang: Optional[str] = None,
+                     memory: Optional[ConversationMemory] = None, priority: int = PRIORITY_INTERACTIVE,
+                     profile_id: Optional[str] = None, profile_keys: Optional[Sequence[str]] = None,
+                     max_tokens: Optional[int] = None) -> Iterator[str]:
+    """
+    Streaming variant of ask_agent.
+    Yields the answer chunk by chunk and returns the full text when exhausted.
+    """
+    with span("request", mode=mode):
+        with span("language_detection"):
+            lang = detect_language(question, lang)
+        return (yield from query_model_stream(question, mode=mode, lang=lang, memory=memory, priority=priority,
+                                              profile_id=profile_id, profile_keys=profile_keys,
+                                              max_tokens=max_tokens))
 
-    # Construct a system prompt using profile info
-    system_prompt = (
-        f"You are {PROFILE_DATA.get('name', 'Julien Vaughan')}, a {PROFILE_DATA.get('role', '')} based in {PROFILE_DATA.get('location', '')}.\n"
-        f"Skills: {', '.join(PROFILE_DATA.get('skills', []))}.\n"
-        f"Experience: {PROFILE_DATA.get('experience', '')}.\n"
-        f"{response_style}"
-    )
+async def aask_agent(question: str, mode: str = "short", lang: Optional[str] = None,
+                     memory: Optional[ConversationMemory] = None, priority: int = PRIORITY_INTERACTIVE,
+                     profile_id: Optional[str] = None, profile_keys: Optional[Sequence[str]] = None,
+                     max_tokens: Optional[int] = None) -> str:
+    """
+    Async variant of ask_agent, for servers handling many sessions on one event loop.
+    Run it as a task to be able to cancel it (task.cancel()).
+    """
+    with span("request", mode=mode):
+        with span("language_detection"):
+            lang = detect_language(question, lang)
+        return await aquery_model(question, mode=mode, lang=lang, memory=memory, priority=priority,
+                                  profile_id=profile_id, profile_keys=profile_keys, max_tokens=max_tokens)
 
-    # Query the model
-    return query_model(question, mode=mode)
+async def aask_agent_stream(question: str, mode: str = "short", lang: Optional[str] = None,
+                            memory: Optional[ConversationMemory] = None,
+                            priority: int = PRIORITY_INTERACTIVE,
+                            profile_id: Optional[str] = None, profile_keys: Optional[Sequence[str]] = None,
+                            max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Async streaming variant of ask_agent (used by the HTTP server's SSE endpoint).
+    Yields the answer chunk by chunk.
+    """
+    with span("request", mode=mode):
+        with span("language_detection"):
+            lang = detect_language(question, lang)
+        async for chunk in aquery_model_stream(question, mode=mode, lang=lang, memory=memory, priority=priority,
+                                               profile_id=profile_id, profile_keys=profile_keys,
+                                               max_tokens=max_tokens):
+            yield chunk
@@ -0,0 +1,102 @@
+# src/answer_store.py
+"""
+Versioned store of precomputed answers (see src/precompute.py).
+A JSON file shipped with the deploy, mapping response-cache keys to answers.
+The store records the profile version and model it was built for; the app
+loads it once at startup and serves those answers without calling the API.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.profile_loader import get_profile_snapshot
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+STORE_FORMAT = 1
+ANSWER_STORE_ENABLED = os.environ.get("ANSWER_STORE", "1") != "0"
+ANSWER_STORE_PATH = Path(os.environ.get("ANSWER_STORE_PATH", ROOT / "data" / "answers.json"))
+
+
+class AnswerStore:
+    def __init__(self, profile_hash: str, model: str, answers: Optional[dict] = None):
+        self.profile_hash = profile_hash
+        self.model = model
+        self.answers = answers or {}  # cache key -> {"question", "mode", "lang", "answer"}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path = ANSWER_STORE_PATH) -> Optional["AnswerStore"]:
+        """Read a store file; None if it is missing or unreadable"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring answer store %s (%s).", path, e)
+            return None
+        if data.get("format") != STORE_FORMAT:
+            logger.warning("Ignoring answer store %s (unsupported format %r).", path, data.get("format"))
+            return None
+        return cls(data["profile_hash"], data["model"], data.get("answers", {}))
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.answers.get(key)
+        return entry["answer"] if entry else None
+
+    def add(self, key: str, question: str, mode: str, lang: str, answer: str) -> None:
+        with self._lock:
+            self.answers[key] = {"question": question, "mode": mode, "lang": lang, "answer": answer}
+
+    def save(self, path: Path = ANSWER_STORE_PATH) -> None:
+        """Write atomically (temp file + rename), so a crash never leaves a partial store"""
+        with self._lock:
+            data = {
+                "format": STORE_FORMAT,
+                "profile_hash": self.profile_hash,
+                "model": self.model,
+                "updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "answers": dict(self.answers),
+            }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, path)
+
+
+# Loaded once per process
+_answer_store = None
+_loaded = False
+_store_lock = threading.Lock()
+
+
+def get_answer_store() -> Optional[AnswerStore]:
+    """
+    The precomputed answers for the current profile, or None.
+    A store built for another profile version is ignored: its keys could
+    never match anyway (the cache key includes the profile hash).
+    """
+    global _answer_store, _loaded
+    if not ANSWER_STORE_ENABLED:
+        return None
+    if not _loaded:
+        with _store_lock:
+            if not _loaded:
+                store = AnswerStore.load()
+                if store is not None and store.profile_hash != get_profile_snapshot().profile_hash:
+                    logger.warning(
+                        "Answer store %s was built for another profile version; ignoring it.", ANSWER_STORE_PATH
+                    )
+                    store = None
+                _answer_store = store
+                _loaded = True
+    return _answer_store
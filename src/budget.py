@@ -0,0 +1,138 @@
+# src/budget.py
+"""
+Pre-flight token budget for each request.
+
+The question is sized before anything is sent: the system prompt and the
+conversation history are counted first, and the question gets what is left
+of MAX_PROMPT_TOKENS (capped at QUESTION_TOKEN_BUDGET). An oversized input,
+typically a pasted job description, is cut down to its most useful lines:
+the opening lines, the requirement / skill / responsibility sections and
+the closing lines (where the actual question usually is).
+
+With the completion capped per mode (MAX_COMPLETION_TOKENS, sent as
+max_tokens), every request has a known worst-case size and cost.
+"""
+import os
+import re
+import unicodedata
+from typing import List, Tuple
+
+from src.utils import estimate_tokens
+
+# Budgets (overridable from the environment)
+MAX_PROMPT_TOKENS = int(os.environ.get("MAX_PROMPT_TOKENS", "6000"))
+QUESTION_TOKEN_BUDGET = int(os.environ.get("QUESTION_TOKEN_BUDGET", "1500"))
+MIN_QUESTION_TOKENS = 200  # kept even when the system prompt is unusually large
+MAX_COMPLETION_TOKENS = {
+    "short": int(os.environ.get("MAX_TOKENS_SHORT", "250")),
+    "long": int(os.environ.get("MAX_TOKENS_LONG", "1200")),
+}
+
+# Share of the budget kept for the start and the end of a trimmed input
+HEAD_SHARE = 0.15
+TAIL_SHARE = 0.15
+
+ELLIPSIS = "[…]"
+
+# Section headings worth keeping in a job description (EN/FR, accents stripped, prefixes)
+RELEVANT_HEADINGS = re.compile(
+    r"\b(requirement|required|qualification|skill|competenc|experience|must have|nice to have|"
+    r"what you (will )?bring|what we are looking for|your profile|about you|responsibilit|"
+    r"you will|mission|profil recherche|votre profil|exigence|requis|prerequis|"
+    r"savoir[ -]faire|atouts|stack|tech|outils|tools|diplome|formation|education)"
+)
+
+_BULLET = re.compile(r"^\s*([-*•·▪–]|\d+[.)])\s+")
+_HEADING_MAX_CHARS = 80
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def _is_heading(line: str) -> bool:
+    """Section title: "Requirements:", "## Skills", "PROFIL RECHERCHÉ", "Your profile"..."""
+    stripped = line.strip().strip("#*_ ")
+    if not stripped or len(stripped) > _HEADING_MAX_CHARS or _BULLET.match(line):
+        return False
+    if stripped.endswith(":") or stripped.isupper() or line.lstrip().startswith("#"):
+        return True
+    # Short capitalized line without sentence punctuation
+    return (len(stripped.split()) <= 5 and stripped[0].isupper()
+            and not any(c in stripped for c in ".!?,;"))
+
+
+def relevant_lines(lines: List[str]) -> List[bool]:
+    """Flags the lines of requirement/skill sections (heading included) and any line naming them"""
+    flags = []
+    in_section = False
+    for line in lines:
+        if not line.strip():
+            flags.append(False)
+            continue
+        relevant = bool(RELEVANT_HEADINGS.search(_fold(line)))
+        if _is_heading(line):
+            in_section = relevant
+        flags.append(in_section or relevant)
+    return flags
+
+
+def _take(lines: List[str], budget: int) -> Tuple[List[int], int]:
+    """Indexes of the leading lines that fit in `budget` tokens"""
+    taken, used = [], 0
+    for i, line in enumerate(lines):
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        taken.append(i)
+        used += cost
+    return taken, used
+
+
+def trim_input(text: str, budget: int) -> str:
+    """
+    `text` if it fits in `budget` tokens, else its opening lines, its relevant
+    sections and its closing lines, in their original order, with "[…]" where
+    lines were dropped.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    lines = text.splitlines()
+    if len(lines) < 3:
+        # One block of text: keep its start and its end
+        keep = max(1, budget * 4 // 2 - len(ELLIPSIS))
+        return f"{text[:keep].rstrip()} {ELLIPSIS} {text[-keep:].lstrip()}"
+
+    head, head_used = _take(lines, int(budget * HEAD_SHARE))
+    tail_rev, tail_used = _take(lines[::-1], int(budget * TAIL_SHARE))
+    keep = set(head) | {len(lines) - 1 - i for i in tail_rev}
+    used = head_used + tail_used
+    # Relevant sections first, then whatever else still fits
+    flags = relevant_lines(lines)
+    for wanted in (True, False):
+        for i, line in enumerate(lines):
+            if flags[i] is wanted and i not in keep and line.strip():
+                cost = estimate_tokens(line)
+                if used + cost <= budget:
+                    keep.add(i)
+                    used += cost
+
+    result, dropped = [], False
+    for i, line in enumerate(lines):
+        if i in keep:
+            if dropped:
+                result.append(ELLIPSIS)
+                dropped = False
+            result.append(line)
+        elif line.strip():
+            dropped = True
+    return "\n".join(result)
+
+
+def question_budget(system_prompt: str, history: List[dict], mode_instruction: str = "") -> int:
+    """Tokens left for the question once the system prompt and history are counted"""
+    used = estimate_tokens(system_prompt) + estimate_tokens(mode_instruction)
+    used += sum(estimate_tokens(message["content"]) for message in history)
+    return max(MIN_QUESTION_TOKENS, min(QUESTION_TOKEN_BUDGET, MAX_PROMPT_TOKENS - used))
+
@@ -0,0 +1,156 @@
+# src/cache.py
+"""
+Two-tier response cache for query_model.
+- In-process LRU for hot entries (example questions).
+- SQLite store on disk so answers survive restarts.
+Entries expire after a TTL and the disk store is capped in size.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from src.profile_loader import get_profile_snapshot
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cache settings (overridable from the environment)
+CACHE_ENABLED = os.environ.get("RESPONSE_CACHE", "1") != "0"
+CACHE_PATH = Path(os.environ.get("RESPONSE_CACHE_PATH", ROOT / "data" / ".cache" / "responses.sqlite"))
+CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+MEMORY_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MEMORY_ENTRIES", "256"))
+DISK_ENTRIES = int(os.environ.get("RESPONSE_CACHE_DISK_ENTRIES", "5000"))
+
+
+def normalize_question(text: str) -> str:
+    """Canonical form of a question: unicode-normalized, casefolded, single-spaced."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(text.split())
+
+
+def profile_hash() -> str:
+    """Short hash identifying the profile version the answers were built from."""
+    return get_profile_snapshot().profile_hash
+
+
+def make_key(question: str, mode: str, model: str, lang: str = "", context: str = "",
+             profile_version: Optional[str] = None) -> str:
+    """
+    Cache key for one (question, mode, model, answer language, profile) combination.
+    `context` identifies any conversation memory sent along with the question.
+    """
+    profile_version = profile_version or profile_hash()
+    raw = "\x1f".join([normalize_question(question), mode, model, lang, context, profile_version])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU in front of a SQLite key/value store with TTL."""
+
+    def __init__(self, path: Optional[Path] = CACHE_PATH, ttl: int = CACHE_TTL,
+                 memory_entries: int = MEMORY_ENTRIES, disk_entries: int = DISK_ENTRIES):
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = self._open(path) if path else None
+
+    def _open(self, path: Path) -> Optional[sqlite3.Connection]:
+        """Open the disk store, or fall back to memory only (e.g. read-only FS)."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed_at)")
+            return db
+        except sqlite3.Error as e:
+            logger.warning("Response cache disabled on disk (%s); using memory only.", e)
+            return None
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            value, expires_at = row
+            if expires_at <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._remember(key, expires_at, value)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._evict(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def _remember(self, key: str, expires_at: float, value: str) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then the least recently used beyond the size cap."""
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_entries,),
+        )
+
+
+# Shared by every session in the process, opened on first use
+_response_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """The process-wide response cache, or None when disabled (RESPONSE_CACHE=0)."""
+    global _response_cache
+    if CACHE_ENABLED and _response_cache is None:
+        with _cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
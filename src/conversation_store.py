@@ -0,0 +1,171 @@
+# src/conversation_store.py
+"""
+Persistent conversation history, per session.
+Turns are appended to a SQLite table on disk; the last TAIL_TURNS turns of
+each active session are also kept in memory. The UI reads one page of turns
+at a time and the transcript is streamed from disk only when exported, so a
+rerun costs the same however long the conversation is. Sessions survive a
+dropped connection (the UI keeps the session id in the URL) and a restart.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Settings (overridable from the environment)
+STORE_PATH = Path(os.environ.get("CONVERSATION_STORE_PATH", ROOT / "data" / ".cache" / "conversations.sqlite"))
+RETENTION_DAYS = float(os.environ.get("CONVERSATION_RETENTION_DAYS", "30"))
+TAIL_TURNS = int(os.environ.get("CONVERSATION_TAIL_TURNS", "20"))
+MAX_SESSIONS = 256  # sessions whose tail is kept in memory
+
+COLUMNS = ("question", "response", "mode", "lang", "created_at")
+
+
+class ConversationStore:
+    """Append-only turns per session: SQLite on disk, recent turns in memory."""
+
+    def __init__(self, path: Optional[Path] = STORE_PATH, retention_days: float = RETENTION_DAYS,
+                 tail_turns: int = TAIL_TURNS, max_sessions: int = MAX_SESSIONS):
+        self.retention_days = retention_days
+        self.tail_turns = tail_turns
+        self.max_sessions = max_sessions
+        self._tails = OrderedDict()  # session_id -> [turn count, deque of recent turns, next turn number]
+        self._lock = threading.Lock()
+        self._db = self._open(path) if path else None
+        # Without a disk store every turn stays in memory
+        self._all = {} if self._db is None else None
+
+    def _open(self, path: Path) -> Optional[sqlite3.Connection]:
+        """Open the disk store, or fall back to memory only (e.g. read-only FS)."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS turns ("
+                "session_id TEXT NOT NULL, turn INTEGER NOT NULL, "
+                "question TEXT NOT NULL, response TEXT NOT NULL, mode TEXT, lang TEXT, "
+                "created_at REAL NOT NULL, PRIMARY KEY (session_id, turn))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_created ON turns(created_at)")
+            if self.retention_days > 0:
+                db.execute("DELETE FROM turns WHERE created_at < ?", (time.time() - self.retention_days * 86400,))
+            return db
+        except sqlite3.Error as e:
+            logger.warning("Conversation store disabled on disk (%s); using memory only.", e)
+            return None
+
+    def _tail(self, session_id: str):
+        """
+        [turn count, recent turns, next turn number] of a session, loaded from
+        disk on first use; lock held. Turn numbers keep growing after old turns
+        are purged, so the next one is not the count.
+        """
+        tail = self._tails.get(session_id)
+        if tail is None:
+            if self._db is None:
+                turns = self._all.setdefault(session_id, [])
+                tail = [len(turns), deque(turns[-self.tail_turns:], maxlen=self.tail_turns), len(turns)]
+            else:
+                count, next_turn = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(MAX(turn) + 1, 0) FROM turns WHERE session_id = ?", (session_id,),
+                ).fetchone()
+                rows = self._db.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM turns WHERE session_id = ? ORDER BY turn DESC LIMIT ?",
+                    (session_id, self.tail_turns),
+                ).fetchall()
+                tail = [count, deque((dict(zip(COLUMNS, row)) for row in reversed(rows)), maxlen=self.tail_turns),
+                        next_turn]
+            self._tails[session_id] = tail
+        self._tails.move_to_end(session_id)
+        while len(self._tails) > self.max_sessions:
+            self._tails.popitem(last=False)
+        return tail
+
+    def append(self, session_id: str, question: str, response: str, mode: str = "", lang: str = "") -> int:
+        """Store a turn; returns the session's number of turns"""
+        turn = dict(zip(COLUMNS, (question, response, mode, lang, time.time())))
+        with self._lock:
+            tail = self._tail(session_id)
+            if self._db is None:
+                self._all[session_id].append(turn)
+            else:
+                self._db.execute(
+                    f"INSERT INTO turns (session_id, turn, {', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, tail[2], *turn.values()),
+                )
+            tail[0] += 1
+            tail[2] += 1
+            tail[1].append(turn)
+            return tail[0]
+
+    def count(self, session_id: str) -> int:
+        with self._lock:
+            return self._tail(session_id)[0]
+
+    def recent(self, session_id: str) -> List[dict]:
+        """The last turns of a session (at most `tail_turns`), oldest first"""
+        with self._lock:
+            return list(self._tail(session_id)[1])
+
+    def page(self, session_id: str, page: int, page_size: int) -> List[dict]:
+        """Turns of page `page` (0 = the oldest `page_size` turns), oldest first"""
+        start = page * page_size
+        with self._lock:
+            count, recent, _ = self._tail(session_id)
+            end = min(start + page_size, count)
+            if start >= end:
+                return []
+            # Recent pages come from memory
+            if start >= count - len(recent):
+                offset = start - (count - len(recent))
+                return list(recent)[offset:offset + end - start]
+            if self._db is None:
+                return self._all[session_id][start:end]
+            # Pages are positions among the stored turns, not turn numbers (purged turns leave gaps)
+            rows = self._db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM turns WHERE session_id = ? ORDER BY turn LIMIT ? OFFSET ?",
+                (session_id, end - start, start),
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def iter_turns(self, session_id: str, batch: int = 100) -> Iterator[dict]:
+        """Every turn of a session, oldest first, read from disk in batches"""
+        for start in range(0, self.count(session_id), batch):
+            yield from self.page(session_id, start // batch, batch)
+
+    def transcript(self, session_id: str) -> Iterator[str]:
+        """The session as "Q: ...\\nA: ..." text, turn by turn"""
+        for i, turn in enumerate(self.iter_turns(session_id)):
+            yield ("\n\n" if i else "") + f"Q: {turn['question']}\nA: {turn['response']}"
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._tails.pop(session_id, None)
+            if self._db is None:
+                self._all.pop(session_id, None)
+            else:
+                self._db.execute("DELETE FROM turns WHERE session_id = ?", (session_id,))
+
+
+# Shared by every session in the process, opened on first use
+_conversation_store = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store() -> ConversationStore:
+    """The process-wide conversation store"""
+    global _conversation_store
+    if _conversation_store is None:
+        with _store_lock:
+            if _conversation_store is None:
+                _conversation_store = ConversationStore()
+    return _conversation_store
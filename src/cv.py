@@ -0,0 +1,153 @@
+# src/cv.py
+"""
+Section-wise CV generation.
+The CV is split into independent sections instead of one long call:
+- Contact, Education and Languages are rendered straight from the profile
+  (built once per profile version, no API call);
+- Skills and Experience are written by the model, concurrently, each with
+  its own short prompt, the profile fields it is written from (no
+  retrieval: Experience gets every position) and its own answer length
+  (MAX_TOKENS_CV_SKILLS / MAX_TOKENS_CV_EXPERIENCE). Only Experience gets
+  the conversation memory, so a new question only regenerates that section.
+
+Model-written sections go through query_model and its response cache,
+keyed by profile version, language, model and (for Experience) memory:
+unchanged sections come back from the cache. The CV is streamed section by
+section, in order, as soon as each one is ready; the whole CV takes about as
+long as its slowest section.
+"""
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, Optional
+
+from src.facts import LANGUAGE_NAMES_FR
+from src.instrumentation import increment, span
+from src.language import detect_language
+from src.memory import ConversationMemory
+from src.profile_loader import get_profile_snapshot
+from src.rate_limiter import PRIORITY_BATCH
+from src.utils import join_items
+
+# Sections in CV order, with their (English, French) headings
+SECTIONS = {
+    "contact": ("Contact", "Contact"),
+    "skills": ("Skills", "Compétences"),
+    "experience": ("Experience", "Expérience"),
+    "education": ("Education", "Formation"),
+    "languages": ("Languages", "Langues"),
+}
+
+# Sections written by the model: prompt template, whether the conversation shapes it,
+# profile fields it is written from and completion cap (tokens)
+WRITTEN_SECTIONS = {
+    "skills": (
+        "Write the Skills section of {name}'s CV for recruiters, in clean Markdown: "
+        "skills grouped by theme as short bullet lists. "
+        "Output only the section content, without a heading.",
+        False,
+        ("skills", "skill_clusters"),
+        int(os.environ.get("MAX_TOKENS_CV_SKILLS", "600")),
+    ),
+    "experience": (
+        "Write the Experience section of {name}'s CV for recruiters, in clean Markdown: "
+        "one entry per position, most recent first, with the role, company and period, "
+        "then 2-3 bullet points of concrete achievements. Emphasize what is relevant to "
+        "the questions asked so far, if any. Output only the section content, without a heading.",
+        True,
+        ("experience", "achievements_highlights"),
+        int(os.environ.get("MAX_TOKENS_CV_EXPERIENCE", "3000")),
+    ),
+}
+
+
+def _contact(profile: dict) -> Dict[str, str]:
+    contact = profile.get("contact") or {}
+    if not isinstance(contact, dict):
+        return {}
+    rows = [("email", "Email", "E-mail"), ("phone", "Phone", "Téléphone"),
+            ("linkedin", "LinkedIn", "LinkedIn"), ("address", "Location", "Localisation")]
+    rows = [(contact[key], en, fr) for key, en, fr in rows if contact.get(key)]
+    if not rows:
+        return {}
+    return {"en": "\n".join(f"- **{en}**: {value}" for value, en, _ in rows),
+            "fr": "\n".join(f"- **{fr}** : {value}" for value, _, fr in rows)}
+
+
+def _education(profile: dict) -> Dict[str, str]:
+    lines = []
+    for entry in profile.get("education") or []:
+        if not isinstance(entry, dict) or not entry.get("program"):
+            continue
+        line = f"- **{entry['program']}**"
+        if entry.get("school"):
+            line += f", {entry['school']}"
+        if entry.get("period"):
+            line += f" ({entry['period']})"
+        details = [entry.get("outcome"), *(entry.get("achievements") or [])]
+        line += "".join(f"\n  - {detail}" for detail in details if detail)
+        lines.append(line)
+    body = "\n".join(lines)
+    return {"en": body, "fr": body} if body else {}
+
+
+def _languages(profile: dict) -> Dict[str, str]:
+    languages = profile.get("languages")
+    if not isinstance(languages, list) or not languages:
+        return {}
+    return {"en": join_items(languages, "and"),
+            "fr": join_items([LANGUAGE_NAMES_FR.get(l, l) for l in languages], "et").capitalize()}
+
+
+def build_static_sections(profile: dict) -> Dict[str, Dict[str, str]]:
+    """section -> {lang: Markdown body} for the sections rendered from the profile"""
+    sections = {"contact": _contact(profile), "education": _education(profile),
+                "languages": _languages(profile)}
+    return {section: body for section, body in sections.items() if body}
+
+
+def _render(section: str, body: str, lang: str) -> str:
+    heading = SECTIONS[section][lang == "fr"]
+    return f"## {heading}\n\n{body.strip()}\n\n"
+
+
+def generate_cv(lang: Optional[str] = None, memory: Optional[ConversationMemory] = None,
+                profile_id: Optional[str] = None, ask: Optional[Callable[..., str]] = None) -> Iterator[str]:
+    """
+    Yield the Markdown CV of a profile section by section, in CV order.
+    Model-written sections are requested concurrently, at batch priority.
+    `ask(prompt, **kwargs) -> str` answers a section prompt; query_model
+    (without the near-duplicate index) if omitted.
+    Raises RuntimeError if a model-written section cannot be generated.
+    """
+    if ask is None:
+        from src.llm_wrapper import query_model
+
+        def ask(prompt, **kwargs):
+            return query_model(prompt, similar=False, **kwargs)
+
+    snapshot = get_profile_snapshot(profile_id)
+    lang = detect_language("", lang)
+    name = snapshot.data.get("name") or "the candidate"
+    static = snapshot.derived("cv_sections", build_static_sections)
+
+    pool = ThreadPoolExecutor(max_workers=len(WRITTEN_SECTIONS), thread_name_prefix="cv")
+    jobs: Dict[str, Future] = {}
+    try:
+        for section, (template, uses_memory, profile_keys, max_tokens) in WRITTEN_SECTIONS.items():
+            jobs[section] = pool.submit(
+                ask, template.format(name=name), mode="long", lang=lang,
+                memory=memory if uses_memory else None, priority=PRIORITY_BATCH, profile_id=profile_id,
+                profile_keys=profile_keys, max_tokens=max_tokens,
+            )
+        yield f"# {name}\n\n"
+        for section in SECTIONS:
+            if section in static:
+                yield _render(section, static[section][lang], lang)
+            elif section in jobs:
+                with span("cv_section", section=section):
+                    body = jobs[section].result()
+                increment("cv_sections", section=section)
+                yield _render(section, body, lang)
+    finally:
+        # Sections not started yet are dropped if the CV is abandoned or fails
+        pool.shutdown(wait=False, cancel_futures=True)
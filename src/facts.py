@@ -0,0 +1,198 @@
+# src/facts.py
+"""
+Local answers to plain profile-fact questions.
+"What is your email?", "Quelles langues parlez-vous ?", "What are your
+skills?" are lookups of fields already in profile.json: a small keyword
+router recognizes them (EN/FR) and answers from templated renderings of
+the profile, built once per profile version. No API call is made.
+
+A question is only routed when every one of its words is filler or belongs
+to a single fact intent; any other word ("What languages do you code in?",
+"Do you have Java skills?", "how did you use Python at IFM?") sends it to
+the model.
+"""
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from src.guard import normalize_text
+from src.profile_loader import ProfileSnapshot, get_profile_snapshot
+from src.utils import join_items
+
+# Settings (overridable from the environment)
+FACTS_ENABLED = os.environ.get("FACT_ANSWERS", "1") != "0"
+MAX_WORDS = 14  # longer questions always go to the model
+
+# Words any fact question may contain (accent-free, casefolded)
+FILLER_WORDS = frozenset("""
+what which is are was your you do does can could please tell me list give show my the a an of
+in to have has i get main key all current currently and or hi hello thanks
+quel quelle quels quelles est sont votre vos vous ce que qu pouvez pourriez donner donnez
+indiquer indiquez moi me la le les l des de du d un une avez en et ou s il bonjour merci
+principales principaux actuel actuelle actuellement
+""".split())
+
+# intent -> (trigger words, extra words allowed with it)
+INTENTS: Dict[str, Tuple[frozenset, frozenset]] = {
+    "email": (frozenset("email mail courriel".split()),
+              frozenset("e address adresse electronique".split())),
+    "phone": (frozenset("phone telephone mobile portable tel".split()),
+              frozenset("number numero call appeler".split())),
+    "linkedin": (frozenset(["linkedin"]),
+                 frozenset("profile profil url link lien".split())),
+    "contact": (frozenset("contact contacter reach joindre coordonnees".split()),
+                frozenset("details information informations how comment where ou".split())),
+    "languages": (frozenset("languages language langues langue speak parlez parles spoken".split()),
+                  frozenset("fluent fluently couramment parler".split())),
+    "skills": (frozenset("skills skill competences competence stack tools outils technologies".split()),
+               frozenset("technical techniques hard top cles core".split())),
+    "education": (frozenset("education degree degrees diploma diplome diplomes studies studied etudes "
+                            "formation formations university universite school ecole".split()),
+                  frozenset("academic background parcours did where ou".split())),
+    "nationalities": (frozenset("nationality nationalities nationalite nationalites citizenship "
+                                "citoyennete passport passeport".split()),
+                      frozenset(())),
+    "location": (frozenset("located location based live localisation situe situee habitez vivez region".split()),
+                 frozenset("where ou city ville country pays".split())),
+}
+
+# Intents that combine into a general contact answer ("email and phone?")
+CONTACT_INTENTS = {"email", "phone", "linkedin", "contact"}
+
+LANGUAGE_NAMES_FR = {
+    "English": "anglais", "French": "français", "Spanish": "espagnol", "German": "allemand",
+    "Italian": "italien", "Portuguese": "portugais", "Dutch": "néerlandais", "Arabic": "arabe",
+    "Chinese": "chinois", "Japanese": "japonais", "Russian": "russe",
+}
+
+SKILL_CLUSTER_LABELS = {
+    "programming": ("Programming", "Programmation"),
+    "analytics_ml": ("Analytics & ML", "Analyse & ML"),
+    "bi_reporting": ("BI & reporting", "BI & reporting"),
+    "automation": ("Automation", "Automatisation"),
+    "ai_llm": ("AI & LLM", "IA & LLM"),
+    "business": ("Business", "Business"),
+}
+
+
+@lru_cache(maxsize=2048)
+def classify(question: str) -> Optional[str]:
+    """Fact intent of a question made only of filler and that intent's words, or None"""
+    words = normalize_text(question).split()
+    if not words or len(words) > MAX_WORDS:
+        return None
+    matched = {intent for intent, (triggers, _) in INTENTS.items() if triggers.intersection(words)}
+    if len(matched) > 1 and matched <= CONTACT_INTENTS:
+        matched = {"contact"}
+    if len(matched) != 1:
+        return None
+    intent = matched.pop()
+    triggers, extras = INTENTS[intent]
+    if intent == "contact":
+        # Any contact channel may be named in a general contact question
+        for channel in CONTACT_INTENTS:
+            triggers = triggers | INTENTS[channel][0] | INTENTS[channel][1]
+    allowed = FILLER_WORDS | triggers | extras
+    # A single other word can change the question ("languages do you code in")
+    if not all(word in allowed for word in words):
+        return None
+    return intent
+
+
+def _contact(profile: dict) -> Dict[str, Dict[str, str]]:
+    contact = profile.get("contact") or {}
+    if not isinstance(contact, dict):
+        return {}
+    answers = {}
+    if contact.get("email"):
+        answers["email"] = {"en": f"You can reach me by email at {contact['email']}.",
+                            "fr": f"Vous pouvez me contacter par e-mail à l'adresse {contact['email']}."}
+    if contact.get("phone"):
+        answers["phone"] = {"en": f"My phone number is {contact['phone']}.",
+                            "fr": f"Mon numéro de téléphone est le {contact['phone']}."}
+    if contact.get("linkedin"):
+        answers["linkedin"] = {"en": f"Here is my LinkedIn profile: {contact['linkedin']}",
+                               "fr": f"Voici mon profil LinkedIn : {contact['linkedin']}"}
+    rows = [("email", "Email", "E-mail"), ("phone", "Phone", "Téléphone"),
+            ("linkedin", "LinkedIn", "LinkedIn"), ("address", "Location", "Localisation")]
+    rows = [(contact[key], label_en, label_fr) for key, label_en, label_fr in rows if contact.get(key)]
+    if rows:
+        answers["contact"] = {
+            "en": "You can contact me here:\n" + "\n".join(f"- {en}: {value}" for value, en, _ in rows),
+            "fr": "Vous pouvez me contacter ici :\n" + "\n".join(f"- {fr} : {value}" for value, _, fr in rows),
+        }
+    return answers
+
+
+def _skills(profile: dict) -> Optional[Dict[str, str]]:
+    clusters = profile.get("skill_clusters")
+    if isinstance(clusters, dict) and clusters:
+        answer = {}
+        for i, (lang, intro) in enumerate((("en", "My main skills:"), ("fr", "Mes principales compétences :"))):
+            lines = [intro]
+            for key, skills in clusters.items():
+                label = SKILL_CLUSTER_LABELS.get(key, (key.replace("_", " ").capitalize(),) * 2)[i]
+                separator = ": " if lang == "en" else " : "
+                lines.append(f"- {label}{separator}{', '.join(map(str, skills))}")
+            answer[lang] = "\n".join(lines)
+        return answer
+    skills = profile.get("skills")
+    if isinstance(skills, list) and skills:
+        listed = ", ".join(map(str, skills))
+        return {"en": f"My main skills: {listed}.", "fr": f"Mes principales compétences : {listed}."}
+    return None
+
+
+def _education(profile: dict) -> Optional[Dict[str, str]]:
+    entries = [e for e in profile.get("education") or [] if isinstance(e, dict) and e.get("program")]
+    if not entries:
+        return None
+    lines = []
+    for entry in entries:
+        line = f"- {entry['program']}"
+        if entry.get("school"):
+            line += f", {entry['school']}"
+        if entry.get("period"):
+            line += f" ({entry['period']})"
+        lines.append(line)
+    body = "\n".join(lines)
+    return {"en": f"My education:\n{body}", "fr": f"Ma formation :\n{body}"}
+
+
+def build_fact_answers(profile: dict) -> Dict[str, Dict[str, str]]:
+    """intent -> {lang: answer}; intents the profile cannot answer are left out"""
+    answers = _contact(profile)
+    languages = profile.get("languages")
+    if isinstance(languages, list) and languages:
+        answers["languages"] = {
+            "en": f"I speak {join_items(languages, 'and')}.",
+            "fr": f"Je parle {join_items([LANGUAGE_NAMES_FR.get(l, l) for l in languages], 'et')}.",
+        }
+    skills = _skills(profile)
+    if skills:
+        answers["skills"] = skills
+    education = _education(profile)
+    if education:
+        answers["education"] = education
+    nationalities = profile.get("nationalities")
+    if isinstance(nationalities, list):
+        nationalities = join_items(nationalities, "and")
+    if nationalities:
+        # Free text in the profile's language: French questions go to the model
+        answers["nationalities"] = {"en": f"I am {nationalities}."}
+    if isinstance(profile.get("location"), str) and profile["location"]:
+        answers["location"] = {"en": f"I am based in {profile['location']}.",
+                               "fr": f"Localisation : {profile['location']}."}
+    return answers
+
+
+def fact_answer(question: str, lang: str, snapshot: Optional[ProfileSnapshot] = None) -> Optional[Tuple[str, str]]:
+    """(intent, templated answer in `lang`) for a plain fact question, else None"""
+    if not FACTS_ENABLED:
+        return None
+    intent = classify(question)
+    if intent is None:
+        return None
+    answers = (snapshot or get_profile_snapshot()).derived("fact_answers", build_fact_answers)
+    answer = answers.get(intent, {}).get(lang)
+    return (intent, answer) if answer else None
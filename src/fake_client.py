@@ -0,0 +1,182 @@
+# src/fake_client.py
+"""
+Offline stand-in for the Mistral client, for benchmarks and local runs
+without an API key (MISTRAL_FAKE=1).
+
+Mimics the parts of the SDK the agent uses (chat.complete, chat.stream and
+their async variants) with configurable latency, token rate, injected 429
+and 503 errors and stalled calls (raising httpx.ReadTimeout once the call's
+timeout_ms is spent), and counts calls so benchmarks can report retries.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Optional
+
+from src.utils import estimate_tokens
+
+FILLER = (
+    "Based on my profile, I delivered measurable results with Python, SQL and "
+    "Power BI, automating reporting and building predictive models."
+).split()
+
+
+class FakeChat:
+    def __init__(self, owner: "FakeMistral"):
+        self._owner = owner
+
+    def complete(self, *, model: str, messages: list, max_tokens: Optional[int] = None,
+                 timeout_ms: Optional[int] = None, **kwargs):
+        text, usage, delay, stall = self._owner._begin(model, messages, max_tokens)
+        self._owner._wait(stall + delay, timeout_ms, time.sleep)
+        return self._owner._response(text, usage)
+
+    def stream(self, *, model: str, messages: list, max_tokens: Optional[int] = None,
+               timeout_ms: Optional[int] = None, **kwargs):
+        text, usage, _, stall = self._owner._begin(model, messages, max_tokens)
+        return self._owner._events(text, usage, time.sleep, stall, timeout_ms)
+
+    async def complete_async(self, *, model: str, messages: list, max_tokens: Optional[int] = None,
+                             timeout_ms: Optional[int] = None, **kwargs):
+        text, usage, delay, stall = self._owner._begin(model, messages, max_tokens)
+        await self._owner._await(stall + delay, timeout_ms)
+        return self._owner._response(text, usage)
+
+    async def stream_async(self, *, model: str, messages: list, max_tokens: Optional[int] = None,
+                           timeout_ms: Optional[int] = None, **kwargs):
+        text, usage, _, stall = self._owner._begin(model, messages, max_tokens)
+        return self._owner._aevents(text, usage, stall, timeout_ms)
+
+
+class FakeMistral:
+    """
+    - latency: seconds before the first token
+    - tokens_per_second: generation speed after the first token
+    - error_rate: probability that a call fails with HTTP 429
+    - failure_rate: probability that a call fails with HTTP 503
+    - stall_rate: probability that a call hangs for `stall_seconds` before answering
+    - requests_per_second: quota; calls above it fail with HTTP 429 (0 = no quota)
+    - completion_tokens: answer length when the request sets no max_tokens
+    """
+
+    def __init__(self, latency: float = 0.5, tokens_per_second: float = 50.0, error_rate: float = 0.0,
+                 requests_per_second: float = 0.0, completion_tokens: int = 120, retry_after: float = 1.0,
+                 failure_rate: float = 0.0, stall_rate: float = 0.0, stall_seconds: float = 120.0,
+                 seed: int = 0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.requests_per_second = requests_per_second
+        self.completion_tokens = completion_tokens
+        self.retry_after = retry_after
+        self.failure_rate = failure_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.chat = FakeChat(self)
+        self.calls = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._recent = deque()  # start times of calls in the last second
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FakeMistral":
+        return cls(
+            latency=float(os.environ.get("FAKE_LATENCY", "0.5")),
+            tokens_per_second=float(os.environ.get("FAKE_TOKENS_PER_SECOND", "50")),
+            error_rate=float(os.environ.get("FAKE_ERROR_RATE", "0")),
+            requests_per_second=float(os.environ.get("FAKE_REQUESTS_PER_SECOND", "0")),
+            failure_rate=float(os.environ.get("FAKE_FAILURE_RATE", "0")),
+            stall_rate=float(os.environ.get("FAKE_STALL_RATE", "0")),
+        )
+
+    def _begin(self, model: str, messages: list, max_tokens: Optional[int]):
+        """Count the call, maybe raise a 429 or a 503, and prepare the answer (and its stall)"""
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1.0:
+                self._recent.popleft()
+            over_quota = self.requests_per_second and len(self._recent) >= self.requests_per_second
+            if over_quota or self._random.random() < self.error_rate:
+                self.rate_limited += 1
+                raise self._rate_limit_error()
+            if self._random.random() < self.failure_rate:
+                raise self._error(503, "Service unavailable")
+            stall = self.stall_seconds if self._random.random() < self.stall_rate else 0.0
+            self._recent.append(now)
+        question = messages[-1]["content"].split("\n")[0]
+        n_tokens = max_tokens or self.completion_tokens
+        words = [f"[{model}]", "Answer", "to:", question[:80]]
+        while len(words) < n_tokens:
+            words.append(FILLER[len(words) % len(FILLER)])
+        text = " ".join(words[:n_tokens])
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=n_tokens,
+                                total_tokens=prompt_tokens + n_tokens)
+        return text, usage, self.latency + n_tokens / self.tokens_per_second, stall
+
+    def _rate_limit_error(self) -> Exception:
+        return self._error(429, "Requests rate limit exceeded", {"Retry-After": str(self.retry_after)})
+
+    @staticmethod
+    def _error(status: int, message: str, headers: Optional[dict] = None) -> Exception:
+        import httpx
+        from mistralai.models import SDKError
+        response = httpx.Response(
+            status, headers=headers or {}, text=f'{{"message":"{message}"}}',
+            request=httpx.Request("POST", "https://api.mistral.ai/v1/chat/completions"),
+        )
+        return SDKError("API error occurred", response)
+
+    @staticmethod
+    def _timeout_error() -> Exception:
+        import httpx
+        return httpx.ReadTimeout("The read operation timed out")
+
+    def _wait(self, seconds: float, timeout_ms: Optional[int], sleep) -> None:
+        """Sleep `seconds`, or raise ReadTimeout once `timeout_ms` is spent"""
+        if timeout_ms is not None and seconds > timeout_ms / 1000:
+            sleep(timeout_ms / 1000)
+            raise self._timeout_error()
+        sleep(seconds)
+
+    async def _await(self, seconds: float, timeout_ms: Optional[int]) -> None:
+        if timeout_ms is not None and seconds > timeout_ms / 1000:
+            await asyncio.sleep(timeout_ms / 1000)
+            raise self._timeout_error()
+        await asyncio.sleep(seconds)
+
+    @staticmethod
+    def _response(text: str, usage):
+        message = SimpleNamespace(role="assistant", content=text)
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")], usage=usage)
+
+    def _chunks(self, text: str):
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == 0 else " " + word
+
+    @staticmethod
+    def _event(delta: str, usage=None):
+        choice = SimpleNamespace(index=0, delta=SimpleNamespace(content=delta), finish_reason=None)
+        return SimpleNamespace(data=SimpleNamespace(choices=[choice], usage=usage))
+
+    def _events(self, text: str, usage, sleep, stall: float = 0.0, timeout_ms: Optional[int] = None):
+        # Like httpx, the timeout applies to each read: here, the wait for the first token
+        self._wait(stall + self.latency, timeout_ms, sleep)
+        for chunk in self._chunks(text):
+            sleep(1 / self.tokens_per_second)
+            yield self._event(chunk)
+        yield self._event("", usage)
+
+    async def _aevents(self, text: str, usage, stall: float = 0.0, timeout_ms: Optional[int] = None):
+        await self._await(stall + self.latency, timeout_ms)
+        for chunk in self._chunks(text):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            yield self._event(chunk)
+        yield self._event("", usage)
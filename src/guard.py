@@ -0,0 +1,190 @@
+# src/guard.py
+"""
+Local pre-filter for prompts the agent must refuse.
+- Identity-override attempts (BANNED_KEYWORDS: "ignore all previous"...)
+- Topics the profile lists under `do_not_answer` (salary, family, health...),
+  matched as whole phrases asking about the candidate's own situation
+
+Prompts are normalized (accents stripped, casefolded, punctuation removed)
+and scanned once with a single compiled regex built as a trie of all the
+terms, so the cost stays linear on long pasted job descriptions. Blocked
+prompts are answered locally: no API call is made just to refuse.
+"""
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.profile_loader import BANNED_KEYWORDS, ProfileSnapshot, get_profile_snapshot
+
+# Topic checks only apply to prompts up to this size: longer texts are pasted
+# documents (job descriptions) where "salary" or "family" appear incidentally
+TOPIC_MAX_CHARS = int(os.environ.get("GUARD_TOPIC_MAX_CHARS", "400"))
+
+# Trigger phrases (EN/FR, matched as whole words) for the profile's do_not_answer topics:
+# questions about the candidate's own situation, not the words alone ("salary data",
+# "political campaign analytics", "disease prediction" are fine).
+# Topics without an entry are matched on their own words.
+TOPIC_TERMS = {
+    "salary expectations": [
+        "salary expectations", "salary expectation", "expected salary", "desired salary", "salary requirements",
+        "your salary", "your current salary", "what salary", "how much do you earn", "how much do you make",
+        "compensation expectations", "pay expectations", "how much do you want to be paid",
+        "pretentions salariales", "pretention salariale", "votre salaire", "salaire souhaite", "salaire actuel",
+        "quel salaire", "combien gagnez vous", "votre remuneration", "remuneration souhaitee",
+    ],
+    "personal family details": [
+        "are you married", "your wife", "your husband", "your girlfriend", "your boyfriend",
+        "your children", "your kids", "your family", "do you have children", "do you have kids",
+        "etes vous marie", "etes vous mariee", "votre epouse", "votre femme", "votre mari",
+        "vos enfants", "votre famille", "avez vous des enfants",
+    ],
+    "private address beyond region": [
+        "home address", "street address", "your address", "what is your address",
+        "where exactly do you live", "where do you live exactly",
+        "adresse exacte", "adresse postale", "votre adresse", "ou habitez vous exactement",
+    ],
+    "political opinions": [
+        "politics", "political views", "political opinions", "political party", "political affiliation",
+        "who did you vote for", "who do you vote for", "who will you vote for", "left wing or right wing",
+        "opinions politiques", "opinion politique", "parti politique", "pour qui votez vous",
+        "pour qui avez vous vote", "de gauche ou de droite",
+    ],
+    "medical history": [
+        "medical history", "medical condition", "medical records", "your health", "health condition",
+        "health issues", "health problems", "are you sick", "any illness", "your illness", "any disability",
+        "a disability", "are you disabled", "any disease",
+        "antecedents medicaux", "dossier medical", "votre sante", "etat de sante", "votre maladie",
+        "une maladie", "votre handicap", "un handicap", "etes vous handicape", "etes vous malade",
+    ],
+}
+
+# Phrases blanked out before the topic scan: they contain a trigger phrase
+# but ask about something else ("votre adresse e-mail", "married to a BI tool")
+ALLOWED_PHRASES = [
+    "adresse e mail", "adresse email", "adresse mail", "adresse electronique", "adresse courriel",
+    "adresse linkedin", "adresse web", "adresse ip",
+    "married to a", "married to an", "married to one", "married to any", "married to the",
+    "famille de competences", "famille de competence", "famille d outils", "famille de produits",
+    "famille de metiers",
+]
+
+# How a topic is named in the English refusal; other topics are named by their label
+TOPIC_NAMES = {
+    "salary expectations": "salary expectations",
+    "personal family details": "my family life",
+    "private address beyond region": "my home address",
+    "political opinions": "political opinions",
+    "medical history": "my health",
+}
+
+REFUSALS = {
+    "override": {
+        "en": "Cannot comply. Instruction violates the enforced user profile.",
+        "fr": "Impossible d'accepter : cette instruction contredit le profil imposé.",
+    },
+    "topic": {
+        "en": "I'd rather not discuss {topic} here. Feel free to ask about my experience, skills or projects.",
+        "fr": "Je préfère ne pas aborder ce sujet ici. N'hésitez pas à m'interroger sur mon expérience, mes compétences ou mes projets.",
+    },
+}
+
+# Bytes other than [0-9a-z] become spaces (a C-level translate, much faster than re.sub)
+_SPACES = bytes(c if 48 <= c <= 57 or 97 <= c <= 122 else 32 for c in range(256))
+
+
+def normalize_text(text: str) -> str:
+    """Accent-free, casefolded ASCII; anything but letters and digits becomes a space"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return text.encode("ascii", "ignore").translate(_SPACES).decode("ascii")
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation factored as a trie, so each position is tried in O(term length)"""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of term
+
+    def emit(node: dict) -> str:
+        # Spaces between words match any run of separators
+        branches = [(" +" if char == " " else re.escape(char)) + emit(child)
+                    for char, child in sorted(node.items()) if char]
+        optional = "" in node
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if optional else group
+
+    return emit(trie)
+
+
+def _compile(terms: Iterable[str], whole_words: bool = False) -> Optional[re.Pattern]:
+    """Trie regex of the terms; with `whole_words`, a term must also end a word"""
+    terms = sorted({" ".join(term.split()) for term in terms if term.strip()})
+    if not terms:
+        return None
+    pattern = _trie_pattern(terms)
+    return re.compile(f"(?:{pattern})(?![0-9a-z])" if whole_words else pattern)
+
+
+def _search(pattern: re.Pattern, text: str) -> Optional[str]:
+    """
+    First term found at the start of a word, normalized to single spaces.
+    The word boundary is checked here rather than with a leading \\b in the
+    pattern, which would disable the regex engine's fast scan for the first characters.
+    """
+    pos = 0
+    while True:
+        match = pattern.search(text, pos)
+        if match is None:
+            return None
+        if match.start() == 0 or text[match.start() - 1] == " ":
+            return " ".join(match.group(0).split())
+        pos = match.start() + 1
+
+
+class Guard:
+    def __init__(self, banned: Iterable[str], topics: Iterable[str]):
+        self._override = _compile(normalize_text(term) for term in banned)
+        self._topic_of: Dict[str, str] = {}
+        for topic in topics:
+            for term in TOPIC_TERMS.get(topic, [topic]):
+                self._topic_of.setdefault(" ".join(normalize_text(term).split()), topic)
+        self._topics = _compile(self._topic_of, whole_words=True)
+        self._allowed = _compile(ALLOWED_PHRASES, whole_words=True)
+
+    def check(self, text: str) -> Optional[Tuple[str, str]]:
+        """("override", term) or ("topic", topic) if the prompt must be refused, else None"""
+        normalized = normalize_text(text)
+        if self._override is not None:
+            term = _search(self._override, normalized)
+            if term:
+                return "override", term
+        if self._topics is not None and len(text) <= TOPIC_MAX_CHARS:
+            term = _search(self._topics, self._allowed.sub(" ", normalized))
+            if term:
+                return "topic", self._topic_of[term]
+        return None
+
+
+def build_guard(profile: dict) -> Guard:
+    return Guard(BANNED_KEYWORDS, profile.get("do_not_answer", []))
+
+
+def get_guard(snapshot: Optional[ProfileSnapshot] = None) -> Guard:
+    """Guard for a profile (the default one when omitted), rebuilt when its file changes"""
+    return (snapshot or get_profile_snapshot()).derived("guard", build_guard)
+
+
+def blocked_reply(text: str, lang: str, snapshot: Optional[ProfileSnapshot] = None) -> Optional[Tuple[str, str]]:
+    """(reason, local refusal in `lang`) if the prompt must not reach the model, else None"""
+    verdict = get_guard(snapshot).check(text)
+    if verdict is None:
+        return None
+    reason, detail = verdict
+    return reason, REFUSALS[reason][lang].format(topic=TOPIC_NAMES.get(detail, detail))
@@ -0,0 +1,258 @@
+# src/instrumentation.py
+"""
+Lightweight, pluggable instrumentation for the agent.
+- span(stage): times a stage (language detection, prompt build, queue wait,
+  upstream call, rendering...)
+- increment(name): counters (cache hits, retries, coalesced requests...)
+- record_usage(model, usage): prompt/completion tokens and estimated cost
+
+Metrics go to an in-process registry, exported as Prometheus text
+(render_prometheus / serve_metrics) and/or to a JSONL sink.
+Disabled by default: span() then returns a shared no-op object and the
+other calls return after a single flag check.
+
+Environment:
+- AGENT_METRICS=1           : enable the in-process registry
+- AGENT_METRICS_JSONL=path  : also append one JSON event per span/usage
+- AGENT_METRICS_PORT=9100   : port for serve_metrics_from_env()
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# USD per million tokens (input, output); unknown models are not costed
+PRICING = {
+    "mistral-small": (0.1, 0.3),
+    "mistral-small-latest": (0.1, 0.3),
+    "mistral-medium": (0.4, 2.0),
+    "mistral-medium-latest": (0.4, 2.0),
+    "mistral-large-latest": (2.0, 6.0),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], list] = {}  # -> [bucket counts..., sum, count]
+
+    def increment(self, name: str, value: float, labels: Labels) -> None:
+        with self._lock:
+            key = (name, labels)
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Labels) -> None:
+        with self._lock:
+            key = (name, labels)
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    hist[i] += 1
+            hist[-2] += value
+            hist[-1] += 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.counters}):
+                lines.append(f"# TYPE {name} counter")
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {name} histogram")
+                for (n, labels), hist in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    for bound, count in zip(BUCKETS, hist):
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', f'{bound:g}'),))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {hist[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {hist[-2]:g}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {hist[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{str(v)}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+class JsonlSink:
+    """Appends one JSON object per event to a file"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict) -> None:
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+
+
+# --- global state ---
+
+ENABLED = False
+REGISTRY = MetricsRegistry()
+_sinks: List[Callable[[dict], None]] = []
+
+
+def configure(enabled: bool = True, jsonl_path: Optional[str] = None) -> None:
+    """Turn instrumentation on/off and optionally add a JSONL sink"""
+    global ENABLED
+    ENABLED = enabled
+    if jsonl_path:
+        add_sink(JsonlSink(jsonl_path))
+
+
+def add_sink(sink: Callable[[dict], None]) -> None:
+    """Register a callable receiving every event (dict); enables instrumentation"""
+    global ENABLED
+    _sinks.append(sink)
+    ENABLED = True
+
+
+def _emit(event: dict) -> None:
+    if _sinks:
+        event["ts"] = time.time()
+        for sink in _sinks:
+            sink(event)
+
+
+def _labels(attrs: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in attrs.items()))
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, stage: str, attrs: dict):
+        self.stage = stage
+        self.attrs = attrs
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        observe(self.stage, seconds, **self.attrs)
+        return False
+
+    def set(self, **attrs) -> None:
+        """Attach attributes discovered during the span (e.g. the model used)"""
+        self.attrs.update(attrs)
+
+
+def span(stage: str, **attrs):
+    """Time a stage: `with span("upstream", model=MODEL): ...`"""
+    if not ENABLED:
+        return NULL_SPAN
+    return _Span(stage, attrs)
+
+
+def observe(stage: str, seconds: float, **attrs) -> None:
+    """Record the duration of a stage measured elsewhere"""
+    if not ENABLED:
+        return
+    # Only low-cardinality attributes become Prometheus labels
+    labels = {k: v for k, v in attrs.items() if k in ("model", "mode", "error")}
+    REGISTRY.observe("agent_stage_seconds", seconds, _labels(dict(labels, stage=stage)))
+    _emit({"type": "span", "stage": stage, "seconds": round(seconds, 6), **attrs})
+
+
+def increment(name: str, value: float = 1, **labels) -> None:
+    """Increment counter `agent_<name>_total`"""
+    if not ENABLED:
+        return
+    REGISTRY.increment(f"agent_{name}_total", value, _labels(labels))
+
+
+def record_usage(model: str, usage) -> None:
+    """Record the `usage` object returned by the SDK (tokens and estimated cost)"""
+    if not ENABLED or usage is None:
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    labels = _labels({"model": model})
+    REGISTRY.increment("agent_prompt_tokens_total", prompt_tokens, labels)
+    REGISTRY.increment("agent_completion_tokens_total", completion_tokens, labels)
+    cost = None
+    if model in PRICING:
+        input_price, output_price = PRICING[model]
+        cost = (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+        REGISTRY.increment("agent_cost_usd_total", cost, labels)
+    _emit({"type": "usage", "model": model, "prompt_tokens": prompt_tokens,
+           "completion_tokens": completion_tokens, "cost_usd": cost})
+
+
+def render_prometheus() -> str:
+    return REGISTRY.render()
+
+
+# --- Prometheus endpoint ---
+
+_server = None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0") -> None:
+    """Serve /metrics from a daemon thread (once per process)"""
+    global _server
+    if _server is not None:
+        return
+    _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+
+
+def serve_metrics_from_env() -> None:
+    port = os.environ.get("AGENT_METRICS_PORT")
+    if port and ENABLED:
+        serve_metrics(int(port))
+
+
+configure(
+    enabled=os.environ.get("AGENT_METRICS", "0") == "1",
+    jsonl_path=os.environ.get("AGENT_METRICS_JSONL"),
+)
@@ -0,0 +1,64 @@
+# src/language.py
+"""
+Fast, deterministic English/French detection.
+The agent only answers in EN or FR, so a stopword/diacritic vote over a
+bounded prefix of the text is enough, and far cheaper than langdetect
+(which is slow to initialize and random unless seeded).
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+SUPPORTED = ("en", "fr")
+DEFAULT_LANG = "en"
+
+# Only the start of the text is inspected (pasted job descriptions can be long)
+MAX_CHARS = 1000
+
+# UI labels from render_language_selector
+UI_LANGUAGES = {"English": "en", "Français": "fr"}
+
+LANGUAGE_NAMES = {"en": "English", "fr": "French"}
+
+ENGLISH_WORDS = frozenset("""
+the a an and or of to in on for with is are was were be been have has had do does
+did can could would should will what which who how why when where you your yours
+this that these those it its my me i we our they their about describe tell from
+as at by not any more most experience skills role job hi hello thanks please
+""".split())
+
+FRENCH_WORDS = frozenset("""
+le la les un une des du de et ou est sont été être avoir avez avons ont pour avec
+dans sur par que qui quoi quel quelle quels quelles comment pourquoi quand où vous
+votre vos ce cette ces il elle nous ils leur mon ma mes je au aux pas plus moins
+expérience compétences poste parlez décrire pouvez êtes bonjour salut merci
+""".split())
+
+FRENCH_CHARS = frozenset("éèêëàâîïôûùüçœ")
+
+_WORD_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+
+@lru_cache(maxsize=2048)
+def _detect(prefix: str) -> str:
+    text = prefix.lower()
+    words = _WORD_RE.findall(text)
+    english = sum(word in ENGLISH_WORDS for word in words)
+    french = sum(word in FRENCH_WORDS for word in words)
+    french += sum(char in FRENCH_CHARS for char in text) * 0.5
+    if french > english:
+        return "fr"
+    return DEFAULT_LANG
+
+
+def detect_language(text: str, ui_lang: Optional[str] = None) -> str:
+    """
+    Return "en" or "fr" for the text.
+    When the UI language is known ("English"/"Français" or a code), it wins
+    and no detection runs. Results are cached per input prefix.
+    """
+    if ui_lang:
+        code = UI_LANGUAGES.get(ui_lang, ui_lang)
+        if code in SUPPORTED:
+            return code
+    return _detect(text[:MAX_CHARS])
@@ -1,48 +1,608 @@
 # src/llm_wrapper.py
-from src.profile_loader import client, PROFILE_CONTEXT, BANNED_KEYWORDS
+from src.profile_loader import ProfileSnapshot, get_client, get_profile_snapshot
+from src.language import LANGUAGE_NAMES, detect_language
+from src.guard import blocked_reply
+from src.facts import fact_answer
+from src.memory import ConversationMemory
+from src.retrieval import build_system_prompt
+from src.cache import get_response_cache, make_key
+from src.answer_store import get_answer_store
+from src.budget import MAX_COMPLETION_TOKENS, question_budget, trim_input
+from src.retry import MAX_RETRIES, api_error_type, is_rate_limited, is_server_failure, retry_delay
+from src.resilience import (BREAKER, LATENCIES, CircuitOpenError, Deadline, DeadlineExceeded,
+                            transport_error_types)
+from src.routing import ROUTER
+from src.rate_limiter import RATE_LIMITER, PRIORITY_INTERACTIVE
+from src.singleflight import SingleFlight
+from src.utils import estimate_tokens
+from src.instrumentation import increment, record_usage, span
+import asyncio
+import logging
+import threading
 import time
-from mistralai.models import SDKError
-
-def enforce_profile(user_input: str) -> str:
-    """Check if user input tries to override identity"""
-    lower_input = user_input.lower()
-    if any(word in lower_input for word in BANNED_KEYWORDS):
-        return "Cannot comply. Instruction violates the enforced user profile."
-    return user_input
-
-def query_model(prompt: str, mode: str = "short") -> str:
-    """Query Mistral API with profile enforcement"""
-    safe_prompt = enforce_profile(prompt)
-    
-    # Add mode instruction
-    mode_instructions = {
-        "short": "\n\nPlease answer concisely in 2-3 sentences.",
-        "long": "\n\nPlease provide a detailed and thorough answer, with examples if applicable."
-    }
-    if mode not in mode_instructions:
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import AsyncIterator, Iterator, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Coalesces concurrent identical requests (keyed like the response cache)
+IN_FLIGHT = SingleFlight()
+
+def enforce_profile(user_input: str, lang: Optional[str] = None,
+                    snapshot: Optional[ProfileSnapshot] = None) -> Optional[str]:
+    """
+    Local refusal if the input tries to override identity or asks about a
+    `do_not_answer` topic of the profile (see src/guard.py), else None.
+    Refused prompts are answered without calling the API.
+    """
+    blocked = blocked_reply(user_input, detect_language(user_input, lang), snapshot)
+    if blocked is None:
+        return None
+    reason, refusal = blocked
+    increment("blocked", reason=reason)
+    return refusal
+
+def local_fact(prompt: str, lang: Optional[str], snapshot: ProfileSnapshot) -> Optional[str]:
+    """
+    Templated answer to a plain profile-fact question (email, languages,
+    skills...; see src/facts.py), else None. No API call is made.
+    """
+    with span("fact_lookup"):
+        fact = fact_answer(prompt, detect_language(prompt, lang), snapshot)
+    if fact is None:
+        return None
+    intent, answer = fact
+    increment("fact_answers", intent=intent)
+    return answer
+
+MODE_INSTRUCTIONS = {
+    "short": "\n\nPlease answer concisely in 2-3 sentences.",
+    "long": "\n\nPlease provide a detailed and thorough answer, with examples if applicable."
+}
+
+
+def language_instruction(lang: str, snapshot: Optional[ProfileSnapshot] = None) -> str:
+    """Answer language plus the profile's response style for that language"""
+    styles = (snapshot or get_profile_snapshot()).data.get("response_style", {})
+    style = styles.get(lang) or styles.get("en", "")
+    if isinstance(style, list):
+        style = " ".join(style)
+    return f"\nAnswer in {LANGUAGE_NAMES[lang]}. {style}"
+
+def _prepare_request(prompt: str, mode: str, lang: Optional[str], memory: Optional[ConversationMemory],
+                     snapshot: ProfileSnapshot, profile_keys: Optional[Sequence[str]] = None,
+                     max_tokens: Optional[int] = None):
+    """Validate the mode and return (cache_key, messages, lang) for a prompt"""
+    if mode not in MODE_INSTRUCTIONS:
         raise ValueError("Invalid mode. Choose 'short' or 'long'.")
-    
-    safe_prompt += mode_instructions[mode]
-
-    # Implement exponential backoff for retries
-    max_retries = 5
-    backoff = 2  # seconds
-
-    for attempt in range(max_retries):
-        try:
-            response = client.chat.complete(
-                model="mistral-medium",
-                messages=[
-                    {"role": "system", "content": PROFILE_CONTEXT},
-                    {"role": "user", "content": safe_prompt},
-                ],
-                temperature=0.0
+    lang = detect_language(prompt, lang)
+    with span("prompt_build", mode=mode):
+        # Only send the profile sections relevant to this question (or the ones asked for)
+        system_prompt = (build_system_prompt(prompt, snapshot=snapshot, keys=profile_keys)
+                         + language_instruction(lang, snapshot))
+        history = []
+        if memory is not None:
+            # Bounded: recent turns verbatim, older ones as a running summary
+            system_prompt += memory.summary_block()
+            history = memory.messages()
+
+        # Oversized input (pasted job description): keep what fits the budget
+        question = trim_input(prompt, question_budget(system_prompt, history, MODE_INSTRUCTIONS[mode]))
+        if question is not prompt:
+            increment("truncated_inputs", mode=mode)
+        safe_prompt = question + MODE_INSTRUCTIONS[mode]
+    messages = [
+        {"role": "system", "content": system_prompt},
+        *history,
+        {"role": "user", "content": safe_prompt},
+    ]
+    context = memory.fingerprint() if memory is not None else ""
+    if profile_keys is not None:
+        context += f"|profile_keys={','.join(profile_keys)}"
+    if max_tokens:
+        context += f"|max_tokens={max_tokens}"
+    # The profile version also namespaces the caches per profile
+    key = make_key(prompt, mode, ROUTER.primary(mode), lang=lang, context=context, profile_version=snapshot.profile_hash)
+    return key, messages, lang
+
+def _request_tokens(messages: list, max_tokens: int) -> int:
+    """Estimated tokens (prompt + completion cap) for the rate limiter"""
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+    return prompt_tokens + max_tokens
+
+def _cached(cache_key: str):
+    # Curated questions answered ahead of time (src/precompute.py)
+    store = get_answer_store()
+    if store is not None:
+        answer = store.get(cache_key)
+        if answer is not None:
+            increment("precomputed_hits")
+            return answer
+    # Deterministic settings: identical questions get identical answers
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    with span("cache_lookup"):
+        answer = cache.get(cache_key)
+    increment("cache_hits" if answer is not None else "cache_misses")
+    return answer
+
+def _semantic_cache(memory: Optional[ConversationMemory]):
+    """The near-duplicate index, unless the question follows up on earlier turns"""
+    if memory is not None and len(memory):
+        return None
+    # Imported on first use: numpy is not needed to start the app
+    from src.semantic_cache import get_semantic_cache
+    return get_semantic_cache()
+
+def _similar(prompt: str, lang: str, mode: str, memory: Optional[ConversationMemory], snapshot: ProfileSnapshot):
+    """Answer of a previously answered rephrasing of the prompt, if any"""
+    index = _semantic_cache(memory)
+    if index is None:
+        return None
+    with span("semantic_lookup"):
+        answer = index.lookup(prompt, lang, mode, ROUTER.primary(mode), snapshot)
+    increment("semantic_hits" if answer is not None else "semantic_misses")
+    return answer
+
+def _remember(prompt: str, lang: str, mode: str, memory: Optional[ConversationMemory], answer: str,
+              snapshot: ProfileSnapshot) -> None:
+    index = _semantic_cache(memory)
+    if index is not None:
+        index.add(prompt, answer, lang, mode, ROUTER.primary(mode), snapshot)
+
+def _store(cache_key: str, answer: str) -> None:
+    cache = get_response_cache()
+    if cache is not None and answer:
+        cache.set(cache_key, answer)
+
+def _candidates(mode: str) -> Iterator[str]:
+    """Models of the mode's route to try in turn, counting fallbacks; fails fast while the circuit is open"""
+    for i, model in enumerate(ROUTER.candidates(mode)):
+        BREAKER.allow()
+        if i:
+            increment("fallbacks", model=model, mode=mode)
+        yield model
+
+def _upstream_errors() -> tuple:
+    """API errors, plus the HTTP client's connection errors and timeouts"""
+    return (api_error_type(), *transport_error_types())
+
+def _succeeded(mode: str, model: str, seconds: float) -> None:
+    ROUTER.record_success(mode, model, seconds)
+    BREAKER.record_success()
+
+def _failed(error: Exception, model: str, mode: str) -> None:
+    increment("upstream_errors", model=model)
+    ROUTER.record_failure(mode, model, error)
+    # 429s are handled by backoff and fallback, other 4xx are the request's fault
+    if not is_rate_limited(error) and is_server_failure(error):
+        BREAKER.record_failure()
+
+def _unavailable(error: Exception) -> RuntimeError:
+    """Error for the caller once every model of the route has failed"""
+    if is_rate_limited(error):
+        return RuntimeError("API overloaded. Please try again later.")
+    if isinstance(error, transport_error_types()):
+        return RuntimeError("The model API is not responding. Please try again later.")
+    status = getattr(error, "status_code", None)
+    detail = f" (HTTP {status})" if status else ""
+    return RuntimeError(f"The model API returned an error{detail}. Please try again later.")
+
+def _retry_wait(error: Exception, attempt: int, mode: str, deadline: Deadline) -> Optional[float]:
+    """
+    Seconds to wait before the next round over the route if every model hit a
+    429 and the wait fits in the deadline, else None
+    """
+    wait_time = retry_delay(error, attempt)
+    if wait_time is None or wait_time >= deadline.remaining():
+        return None
+    increment("retries", mode=mode)
+    logger.info("Rate limit hit on every model. Retrying in %.1f seconds.", wait_time)
+    return wait_time
+
+def _degraded(prompt: str, lang: str, mode: str, snapshot: ProfileSnapshot) -> Optional[str]:
+    """While the circuit is open: the answer to a similar question, even for a follow-up or in the other mode"""
+    from src.semantic_cache import get_semantic_cache
+    index = get_semantic_cache()
+    if index is None:
+        return None
+    for other in (mode, *(m for m in MODE_INSTRUCTIONS if m != mode)):
+        answer = index.lookup(prompt, lang, other, ROUTER.primary(other), snapshot)
+        if answer is not None:
+            increment("degraded_answers", mode=mode)
+            return answer
+    return None
+
+def query_model(prompt: str, mode: str = "short", lang: Optional[str] = None,
+                memory: Optional[ConversationMemory] = None, priority: int = PRIORITY_INTERACTIVE,
+                profile_id: Optional[str] = None, similar: bool = True,
+                profile_keys: Optional[Sequence[str]] = None, max_tokens: Optional[int] = None) -> str:
+    """
+    Query Mistral API with profile enforcement.
+    `lang` ("en"/"fr") sets the answer language; detected from the prompt if omitted.
+    `memory` (ConversationMemory) adds the previous turns of the conversation.
+    `profile_id` selects the candidate profile (see ProfileRegistry); default profile if omitted.
+    `similar=False` skips the near-duplicate index (templated prompts that differ by a few words).
+    `profile_keys` sends these profile fields instead of the sections retrieved for the prompt
+    (which then skips the near-duplicate index too); `max_tokens` replaces the mode's completion cap.
+    Raises DeadlineExceeded past the mode's deadline (see src/resilience.py).
+    """
+    deadline = Deadline.for_mode(mode)
+    snapshot = get_profile_snapshot(profile_id)
+    local = enforce_profile(prompt, lang, snapshot) or local_fact(prompt, lang, snapshot)
+    if local is not None:
+        return local
+    cache_key, messages, lang = _prepare_request(prompt, mode, lang, memory, snapshot,
+                                                 profile_keys, max_tokens)
+    max_tokens = max_tokens or MAX_COMPLETION_TOKENS[mode]
+    similar = similar and profile_keys is None
+    cached = _cached(cache_key)
+    if cached is None and similar:
+        cached = _similar(prompt, lang, mode, memory, snapshot)
+    if cached is not None:
+        return cached
+    try:
+        # Identical questions already in flight share the same upstream call
+        answer = IN_FLIGHT.do(cache_key,
+                              lambda: _complete(cache_key, messages, mode, max_tokens, priority, deadline))
+    except CircuitOpenError:
+        degraded = _degraded(prompt, lang, mode, snapshot) if similar else None
+        if degraded is None:
+            raise
+        return degraded
+    if similar:
+        _remember(prompt, lang, mode, memory, answer, snapshot)
+    return answer
+
+def _call(model: str, messages: list, mode: str, tokens: int, max_tokens: int,
+          priority: int, deadline: Deadline):
+    """One upstream completion, queued and bounded by the deadline"""
+    with RATE_LIMITER.acquire(tokens, priority, timeout=deadline.remaining()), \
+            span("upstream", model=model, mode=mode):
+        started = time.perf_counter()
+        response = get_client().chat.complete(
+            model=model,
+            messages=messages,
+            temperature=0.0,
+            max_tokens=max_tokens,
+            timeout_ms=deadline.timeout_ms(mode)
+        )
+        seconds = time.perf_counter() - started
+    _succeeded(mode, model, seconds)
+    LATENCIES.observe(mode, seconds)
+    record_usage(model, getattr(response, "usage", None))
+    return response
+
+# Runs hedged calls (HEDGE_REQUESTS=1), created on first use
+_hedge_pool = None
+_hedge_lock = threading.Lock()
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _hedge_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(max_workers=2 * RATE_LIMITER.max_concurrency,
+                                                 thread_name_prefix="hedge")
+    return _hedge_pool
+
+def _hedged_call(model: str, messages: list, mode: str, tokens: int, max_tokens: int,
+                 priority: int, deadline: Deadline):
+    """_call, plus an identical second call if an interactive one is slower than the mode's p95"""
+    delay = LATENCIES.hedge_delay(mode) if priority == PRIORITY_INTERACTIVE else None
+    if delay is None or delay >= deadline.remaining():
+        return _call(model, messages, mode, tokens, max_tokens, priority, deadline)
+    pool = _hedge_executor()
+    first = pool.submit(_call, model, messages, mode, tokens, max_tokens, priority, deadline)
+    try:
+        return first.result(timeout=delay)
+    except FutureTimeout:
+        pass
+    increment("hedged_requests", mode=mode)
+    hedge = pool.submit(_call, model, messages, mode, tokens, max_tokens, priority, deadline)
+    pending = {first, hedge}
+    while pending:
+        # The slower call runs to completion in the background; its latency is still recorded
+        done, pending = wait(pending, timeout=max(0.0, deadline.remaining()), return_when=FIRST_COMPLETED)
+        if not done:
+            raise DeadlineExceeded()
+        for future in done:
+            error = future.exception()
+            if error is None:
+                if future is hedge:
+                    increment("hedge_wins", mode=mode)
+                return future.result()
+            if pending and isinstance(error, _upstream_errors()):
+                _failed(error, model, mode)
+    raise error
+
+def _complete(cache_key: str, messages: list, mode: str, max_tokens: int, priority: int,
+              deadline: Deadline) -> str:
+    tokens = _request_tokens(messages, max_tokens)
+    for attempt in range(MAX_RETRIES):
+        # Rate-limited or failing models fall back to the next one of the route
+        for model in _candidates(mode):
+            try:
+                response = _hedged_call(model, messages, mode, tokens, max_tokens, priority, deadline)
+                answer = response.choices[0].message.content.strip()
+                _store(cache_key, answer)
+                return answer
+            except _upstream_errors() as e:
+                _failed(e, model, mode)
+                error = e
+        wait_time = _retry_wait(error, attempt, mode, deadline)
+        if wait_time is None:
+            raise _unavailable(error) from error
+        time.sleep(wait_time)
+
+def query_model_stream(prompt: str, mode: str = "short", lang: Optional[str] = None,
+                       memory: Optional[ConversationMemory] = None, priority: int = PRIORITY_INTERACTIVE,
+                       profile_id: Optional[str] = None, profile_keys: Optional[Sequence[str]] = None,
+                       max_tokens: Optional[int] = None) -> Iterator[str]:
+    """
+    Stream the answer from the Mistral API as text chunks.
+    The generator returns the full answer when exhausted, and stores it in the cache.
+    """
+    deadline = Deadline.for_mode(mode)
+    snapshot = get_profile_snapshot(profile_id)
+    local = enforce_profile(prompt, lang, snapshot) or local_fact(prompt, lang, snapshot)
+    if local is not None:
+        yield local
+        return local
+    cache_key, messages, lang = _prepare_request(prompt, mode, lang, memory, snapshot,
+                                                 profile_keys, max_tokens)
+    max_tokens = max_tokens or MAX_COMPLETION_TOKENS[mode]
+    similar = profile_keys is None
+    cached = _cached(cache_key) or (_similar(prompt, lang, mode, memory, snapshot) if similar else None)
+    if cached is not None:
+        yield cached
+        return cached
+    try:
+        # Late joiners of an in-flight stream get every chunk from the start
+        answer = yield from IN_FLIGHT.stream(
+            cache_key, lambda: _stream(cache_key, messages, mode, max_tokens, priority, deadline))
+    except CircuitOpenError:
+        # Raised before any chunk: the circuit is checked before each model is tried
+        degraded = _degraded(prompt, lang, mode, snapshot) if similar else None
+        if degraded is None:
+            raise
+        yield degraded
+        return degraded
+    if similar:
+        _remember(prompt, lang, mode, memory, answer, snapshot)
+    return answer
+
+def _stream(cache_key: str, messages: list, mode: str, max_tokens: int, priority: int,
+            deadline: Deadline) -> Iterator[str]:
+    tokens = _request_tokens(messages, max_tokens)
+    for attempt in range(MAX_RETRIES):
+        for model in _candidates(mode):
+            parts = []
+            try:
+                # The concurrency slot is held until the stream is fully read
+                with RATE_LIMITER.acquire(tokens, priority, timeout=deadline.remaining()), \
+                        span("upstream", model=model, mode=mode):
+                    started = time.perf_counter()
+                    # The HTTP timeout bounds the wait for each chunk, the deadline the whole stream
+                    stream = get_client().chat.stream(
+                        model=model,
+                        messages=messages,
+                        temperature=0.0,
+                        max_tokens=max_tokens,
+                        timeout_ms=deadline.timeout_ms(mode)
+                    )
+                    first_token = None
+                    for event in stream:
+                        # The last event carries the token usage of the whole stream
+                        usage = getattr(event.data, "usage", None)
+                        if usage is not None:
+                            record_usage(model, usage)
+                        delta = event.data.choices[0].delta.content
+                        if isinstance(delta, str) and delta:
+                            if first_token is None:
+                                first_token = time.perf_counter() - started
+                            parts.append(delta)
+                            yield delta
+                        deadline.check()
+                    # A stream's latency is its time to first token: long answers are not slow models
+                    _succeeded(mode, model, first_token if first_token is not None else time.perf_counter() - started)
+                answer = "".join(parts).strip()
+                _store(cache_key, answer)
+                return answer
+            except _upstream_errors() as e:
+                _failed(e, model, mode)
+                # Only fall back or retry if nothing has been shown to the user yet
+                if parts:
+                    raise _unavailable(e) from e
+                error = e
+        wait_time = _retry_wait(error, attempt, mode, deadline)
+        if wait_time is None:
+            raise _unavailable(error) from error
+        time.sleep(wait_time)
+
+async def aquery_model(prompt: str, mode: str = "short", lang: Optional[str] = None,
+                       memory: Optional[ConversationMemory] = None, priority: int = PRIORITY_INTERACTIVE,
+                       profile_id: Optional[str] = None, profile_keys: Optional[Sequence[str]] = None,
+                       max_tokens: Optional[int] = None) -> str:
+    """
+    Async variant of query_model.
+    Backoff uses asyncio.sleep, so a rate-limited request does not block the
+    event loop, and cancelling the task stops any pending retry.
+    """
+    deadline = Deadline.for_mode(mode)
+    snapshot = get_profile_snapshot(profile_id)
+    local = enforce_profile(prompt, lang, snapshot) or local_fact(prompt, lang, snapshot)
+    if local is not None:
+        return local
+    cache_key, messages, lang = _prepare_request(prompt, mode, lang, memory, snapshot,
+                                                 profile_keys, max_tokens)
+    max_tokens = max_tokens or MAX_COMPLETION_TOKENS[mode]
+    similar = profile_keys is None
+    cached = _cached(cache_key) or (_similar(prompt, lang, mode, memory, snapshot) if similar else None)
+    if cached is not None:
+        return cached
+    try:
+        answer = await IN_FLIGHT.ado(
+            cache_key, lambda: _acomplete(cache_key, messages, mode, max_tokens, priority, deadline))
+    except CircuitOpenError:
+        degraded = _degraded(prompt, lang, mode, snapshot) if similar else None
+        if degraded is None:
+            raise
+        return degraded
+    if similar:
+        _remember(prompt, lang, mode, memory, answer, snapshot)
+    return answer
+
+async def _acall(model: str, messages: list, mode: str, tokens: int, max_tokens: int,
+                 priority: int, deadline: Deadline):
+    """Async variant of _call"""
+    async with RATE_LIMITER.acquire_async(tokens, priority, timeout=deadline.remaining()):
+        with span("upstream", model=model, mode=mode):
+            started = time.perf_counter()
+            response = await get_client().chat.complete_async(
+                model=model,
+                messages=messages,
+                temperature=0.0,
+                max_tokens=max_tokens,
+                timeout_ms=deadline.timeout_ms(mode)
             )
-            return response.choices[0].message.content.strip()
-        except SDKError as e:
-            if "Status 429" in str(e) and attempt < max_retries - 1:
-                wait_time = backoff * (2 ** attempt)
-                print(f"Rate limit hit. Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
-                continue
-            raise RuntimeError("API overloaded. Please try again later.") from e
+            seconds = time.perf_counter() - started
+    _succeeded(mode, model, seconds)
+    LATENCIES.observe(mode, seconds)
+    record_usage(model, getattr(response, "usage", None))
+    return response
+
+async def _ahedged_call(model: str, messages: list, mode: str, tokens: int, max_tokens: int,
+                        priority: int, deadline: Deadline):
+    """Async variant of _hedged_call; the slower call is cancelled"""
+    delay = LATENCIES.hedge_delay(mode) if priority == PRIORITY_INTERACTIVE else None
+    if delay is None or delay >= deadline.remaining():
+        return await _acall(model, messages, mode, tokens, max_tokens, priority, deadline)
+    first = asyncio.ensure_future(_acall(model, messages, mode, tokens, max_tokens, priority, deadline))
+    pending = {first}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return first.result()
+        increment("hedged_requests", mode=mode)
+        hedge = asyncio.ensure_future(_acall(model, messages, mode, tokens, max_tokens, priority, deadline))
+        pending = {first, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, deadline.remaining()),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded()
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    if task is hedge:
+                        increment("hedge_wins", mode=mode)
+                    return task.result()
+                if pending and isinstance(error, _upstream_errors()):
+                    _failed(error, model, mode)
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def _acomplete(cache_key: str, messages: list, mode: str, max_tokens: int, priority: int,
+                     deadline: Deadline) -> str:
+    tokens = _request_tokens(messages, max_tokens)
+    for attempt in range(MAX_RETRIES):
+        for model in _candidates(mode):
+            try:
+                response = await _ahedged_call(model, messages, mode, tokens, max_tokens, priority, deadline)
+                answer = response.choices[0].message.content.strip()
+                _store(cache_key, answer)
+                return answer
+            except _upstream_errors() as e:
+                _failed(e, model, mode)
+                error = e
+        wait_time = _retry_wait(error, attempt, mode, deadline)
+        if wait_time is None:
+            raise _unavailable(error) from error
+        await asyncio.sleep(wait_time)
+
+async def aquery_model_stream(prompt: str, mode: str = "short", lang: Optional[str] = None,
+                              memory: Optional[ConversationMemory] = None,
+                              priority: int = PRIORITY_INTERACTIVE,
+                              profile_id: Optional[str] = None, profile_keys: Optional[Sequence[str]] = None,
+                              max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+    """
+    Async variant of query_model_stream, for servers (see src/server.py).
+    Yields text chunks; async generators cannot return a value, so callers
+    join the chunks themselves. Concurrent identical streams are not coalesced.
+    """
+    deadline = Deadline.for_mode(mode)
+    snapshot = get_profile_snapshot(profile_id)
+    local = enforce_profile(prompt, lang, snapshot) or local_fact(prompt, lang, snapshot)
+    if local is not None:
+        yield local
+        return
+    cache_key, messages, lang = _prepare_request(prompt, mode, lang, memory, snapshot,
+                                                 profile_keys, max_tokens)
+    max_tokens = max_tokens or MAX_COMPLETION_TOKENS[mode]
+    similar = profile_keys is None
+    cached = _cached(cache_key) or (_similar(prompt, lang, mode, memory, snapshot) if similar else None)
+    if cached is not None:
+        yield cached
+        return
+    parts = []
+    try:
+        async for delta in _astream(cache_key, messages, mode, max_tokens, priority, deadline):
+            parts.append(delta)
+            yield delta
+    except CircuitOpenError:
+        degraded = _degraded(prompt, lang, mode, snapshot) if similar else None
+        if degraded is None:
+            raise
+        yield degraded
+        return
+    if similar:
+        _remember(prompt, lang, mode, memory, "".join(parts).strip(), snapshot)
+
+async def _astream(cache_key: str, messages: list, mode: str, max_tokens: int, priority: int,
+                   deadline: Deadline) -> AsyncIterator[str]:
+    tokens = _request_tokens(messages, max_tokens)
+    for attempt in range(MAX_RETRIES):
+        for model in _candidates(mode):
+            parts = []
+            try:
+                async with RATE_LIMITER.acquire_async(tokens, priority, timeout=deadline.remaining()):
+                    with span("upstream", model=model, mode=mode):
+                        started = time.perf_counter()
+                        stream = await get_client().chat.stream_async(
+                            model=model,
+                            messages=messages,
+                            temperature=0.0,
+                            max_tokens=max_tokens,
+                            timeout_ms=deadline.timeout_ms(mode)
+                        )
+                        first_token = None
+                        async for event in stream:
+                            usage = getattr(event.data, "usage", None)
+                            if usage is not None:
+                                record_usage(model, usage)
+                            delta = event.data.choices[0].delta.content
+                            if isinstance(delta, str) and delta:
+                                if first_token is None:
+                                    first_token = time.perf_counter() - started
+                                parts.append(delta)
+                                yield delta
+                            deadline.check()
+                        _succeeded(mode, model,
+                                   first_token if first_token is not None else time.perf_counter() - started)
+                _store(cache_key, "".join(parts).strip())
+                return
+            except _upstream_errors() as e:
+                _failed(e, model, mode)
+                # Only fall back or retry if nothing has been sent to the client yet
+                if parts:
+                    raise _unavailable(e) from e
+                error = e
+        wait_time = _retry_wait(error, attempt, mode, deadline)
+        if wait_time is None:
+            raise _unavailable(error) from error
+        await asyncio.sleep(wait_time)
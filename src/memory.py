@@ -0,0 +1,99 @@
+# src/memory.py
+"""
+Bounded conversation memory for multi-turn sessions.
+The most recent turns are sent verbatim as chat messages within a token
+budget; older turns are folded into a short running summary, so the size of
+each request stays flat however long the session gets.
+"""
+import hashlib
+import os
+import re
+from collections import deque
+from typing import List
+
+from src.utils import estimate_tokens
+
+# Budgets (overridable from the environment)
+MEMORY_TOKEN_BUDGET = int(os.environ.get("MEMORY_TOKEN_BUDGET", "1500"))
+MEMORY_SUMMARY_BUDGET = int(os.environ.get("MEMORY_SUMMARY_BUDGET", "300"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def summarize_turn(question: str, answer: str) -> str:
+    """One summary line per turn: the question and the first sentence of the answer"""
+    first_sentence = _SENTENCE_END.split(" ".join(answer.split()), maxsplit=1)[0]
+    return f"- Q: {_shorten(question, 160)} → A: {_shorten(first_sentence, 200)}"
+
+
+class ConversationMemory:
+    def __init__(self, token_budget: int = MEMORY_TOKEN_BUDGET, summary_budget: int = MEMORY_SUMMARY_BUDGET):
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.turns = deque()  # (question, answer, tokens)
+        self.summary_lines: List[str] = []
+        self._turn_tokens = 0
+
+    def __len__(self) -> int:
+        return len(self.turns) + len(self.summary_lines)
+
+    def add(self, question: str, answer: str) -> None:
+        tokens = estimate_tokens(question) + estimate_tokens(answer)
+        self.turns.append((question, answer, tokens))
+        self._turn_tokens += tokens
+        self._compact()
+
+    def _compact(self) -> None:
+        """Fold the oldest turns into the summary until the recent turns fit the budget"""
+        while self.turns and self._turn_tokens > self.token_budget:
+            question, answer, tokens = self.turns.popleft()
+            self._turn_tokens -= tokens
+            self.summary_lines.append(summarize_turn(question, answer))
+        while len(self.summary_lines) > 1 and estimate_tokens(self.summary()) > self.summary_budget:
+            self.summary_lines.pop(0)
+
+    def summary(self) -> str:
+        return "\n".join(self.summary_lines)
+
+    def summary_block(self) -> str:
+        """Text appended to the system prompt (empty when nothing was summarized)"""
+        if not self.summary_lines:
+            return ""
+        return f"\nEarlier in this conversation:\n{self.summary()}\n"
+
+    def messages(self) -> List[dict]:
+        """Recent turns as alternating user/assistant chat messages"""
+        messages = []
+        for question, answer, _ in self.turns:
+            messages.append({"role": "user", "content": question})
+            messages.append({"role": "assistant", "content": answer})
+        return messages
+
+    def as_text(self) -> str:
+        """Compact transcript (summary + recent turns), e.g. to give context to the CV"""
+        parts = [self.summary()] if self.summary_lines else []
+        parts += [f"Q: {question}\nA: {answer}" for question, answer, _ in self.turns]
+        return "\n\n".join(parts)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable state, e.g. to send the conversation to src/server.py"""
+        return {"summary": list(self.summary_lines), "turns": [[q, a] for q, a, _ in self.turns]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConversationMemory":
+        memory = cls()
+        memory.summary_lines = [str(line) for line in data.get("summary", [])]
+        for question, answer in data.get("turns", []):
+            memory.add(str(question), str(answer))
+        return memory
+
+    def fingerprint(self) -> str:
+        """Short hash of the memory content, part of the cache key ('' when empty)"""
+        if not len(self):
+            return ""
+        return hashlib.sha256(self.as_text().encode("utf-8")).hexdigest()[:16]
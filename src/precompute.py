@@ -0,0 +1,107 @@
+# src/precompute.py
+"""
+Batch precomputation of curated answers.
+
+Runs the app's example questions and the profile's sample questions (both
+modes) through ask_agent with a bounded thread pool, and writes the answers
+to the versioned answer store (data/answers.json) that the app loads at
+startup. Requests go through the shared rate limiter at batch priority.
+
+The store doubles as the checkpoint: it is saved after every answer, and a
+rerun only computes the missing ones (unless --force).
+
+Usage:
+    llm-profile-precompute --workers 4
+    python -m src.precompute --modes short --output data/answers.json
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from src import answer_store, cache, semantic_cache
+from src.agent import ask_agent
+from src.answer_store import ANSWER_STORE_PATH, AnswerStore
+from src.cache import make_key
+from src.llm_wrapper import MODE_INSTRUCTIONS
+from src.profile_loader import get_profile, get_profile_snapshot
+from src.questions import curated_questions
+from src.rate_limiter import PRIORITY_BATCH
+from src.routing import ROUTER
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="parallel requests (the rate limiter still applies)")
+    parser.add_argument("--modes", default=",".join(MODE_INSTRUCTIONS), help="comma-separated answer modes")
+    parser.add_argument("--output", type=Path, default=ANSWER_STORE_PATH, help="answer store to write")
+    parser.add_argument("--force", action="store_true", help="recompute every answer, bypassing the response cache")
+    return parser.parse_args(argv)
+
+
+def open_store(path: Path, profile_hash: str, force: bool) -> AnswerStore:
+    """Resume from an existing store built for the same profile and models"""
+    models = ROUTER.signature()
+    store = None if force else AnswerStore.load(path)
+    if store is not None and (store.profile_hash, store.model) != (profile_hash, models):
+        print(f"{path} was built for another profile version or model; starting over.")
+        store = None
+    return store or AnswerStore(profile_hash, models)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    for mode in modes:
+        if mode not in MODE_INSTRUCTIONS:
+            print(f"Unknown mode {mode!r}; choose from {', '.join(MODE_INSTRUCTIONS)}.")
+            return 2
+
+    # Answers must come from the API (or the response cache), never from the store
+    # being built or from a similar curated question
+    answer_store.ANSWER_STORE_ENABLED = False
+    semantic_cache.SEMANTIC_ENABLED = False
+    if args.force:
+        cache.CACHE_ENABLED = False
+
+    profile_hash = get_profile_snapshot().profile_hash
+    store = open_store(args.output, profile_hash, args.force)
+    jobs = []
+    for question, lang in curated_questions(get_profile()):
+        for mode in modes:
+            key = make_key(question, mode, ROUTER.primary(mode), lang=lang, profile_version=profile_hash)
+            if key not in store.answers:
+                jobs.append((key, question, mode, lang))
+    total = len(jobs) + len(store.answers)
+    print(f"{len(store.answers)} answers already stored, {len(jobs)} to compute with {args.workers} workers.")
+
+    done, failed = 0, 0
+    started = time.perf_counter()
+
+    def run(job):
+        key, question, mode, lang = job
+        return ask_agent(question, mode=mode, lang=lang, priority=PRIORITY_BATCH)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            key, question, mode, lang = futures[future]
+            try:
+                answer = future.result()
+            except RuntimeError as e:  # API overloaded or queue full: retried on the next run
+                failed += 1
+                print(f"  failed [{lang}/{mode}] {question[:60]!r}: {e}")
+                continue
+            store.add(key, question, mode, lang, answer)
+            store.save(args.output)  # checkpoint
+            done += 1
+            print(f"  [{len(store.answers)}/{total}] {lang}/{mode} {question[:60]!r}")
+
+    elapsed = time.perf_counter() - started
+    print(f"Computed {done} answers in {elapsed:.1f}s ({failed} failed); store: {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
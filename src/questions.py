@@ -0,0 +1,42 @@
+# src/questions.py
+"""
+Curated question sets: the example questions offered in the app and the
+profile's sample questions. Shared by the UI and the precompute CLI.
+"""
+from typing import Iterator, Tuple
+
+from src.language import UI_LANGUAGES
+
+# Example questions shown in the app, per UI language
+EXAMPLE_QUESTIONS = {
+    "English": [
+        "Can you describe how you built the Top Prospect Model at IFM and the measurable impact it had?",
+        "How did you enrich CRM data with public sources and what business value did it unlock?",
+        "What is your Profit Threshold Credit Approval Model and how does it differ from traditional ML approaches?",
+        "How have you automated processes in your roles (e.g., pricing, reporting, marketing) and what time savings did you achieve?",
+        "Can you explain the Personal AI Agent project and how it demonstrates your skills in LLM integration?",
+        "What innovative projects have you done outside of work, such as healthcare or education-related automation?",
+        "How have you influenced C-level decision-making through analytics and dashboards?"
+    ],
+    "Français": [
+        "Pouvez-vous décrire comment vous avez construit le modèle de prospection chez IFM et son impact mesurable ?",
+        "Comment avez-vous enrichi le CRM avec des données publiques et quelle valeur business cela a-t-il généré ?",
+        "Qu’est-ce que votre modèle d’approbation de crédit basé sur le seuil de rentabilité et en quoi diffère-t-il des approches classiques ?",
+        "Comment avez-vous automatisé des processus (prix, reporting, marketing) et quels gains de temps concrets avez-vous obtenus ?",
+        "Pouvez-vous expliquer le projet Agent Personnel IA et en quoi il démontre vos compétences en intégration LLM ?",
+        "Quels projets innovants avez-vous réalisés en dehors du travail, comme l’automatisation dans la santé ou l’éducation ?",
+        "Comment vos analyses ont-elles influencé des décisions stratégiques au niveau de la direction générale ?"
+    ]
+}
+
+
+def curated_questions(profile: dict) -> Iterator[Tuple[str, str]]:
+    """(question, lang) pairs: the app's example questions then the profile's sample questions"""
+    seen = set()
+    pairs = [(q, UI_LANGUAGES[ui_lang]) for ui_lang, questions in EXAMPLE_QUESTIONS.items() for q in questions]
+    for item in profile.get("sample_questions", []):
+        pairs += [(item[f"question_{lang}"], lang) for lang in ("en", "fr") if item.get(f"question_{lang}")]
+    for pair in pairs:
+        if pair not in seen:
+            seen.add(pair)
+            yield pair
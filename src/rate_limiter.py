@@ -0,0 +1,179 @@
+# src/rate_limiter.py
+"""
+Process-wide limiter in front of the Mistral API, shared by every Streamlit session.
+- Token buckets for requests/min and tokens/min.
+- A cap on concurrent upstream calls.
+- A bounded priority queue: interactive questions go before batch jobs
+  (CV generation), and callers fail fast when the queue is full.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from src.instrumentation import observe
+from src.resilience import DeadlineExceeded
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+POLL_INTERVAL = 0.05  # seconds, async waiters re-check the queue this often
+
+
+class QueueFullError(RuntimeError):
+    """Raised when too many requests are already waiting for the API"""
+
+    def __init__(self):
+        super().__init__("Server busy: too many requests are queued. Please try again in a moment.")
+
+
+class _Bucket:
+    """Token bucket refilled continuously at `per_minute` units per minute"""
+
+    def __init__(self, per_minute: float, burst_seconds: float = 5.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        amount = min(amount, self.capacity)  # oversized requests only wait for a full bucket
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: float = 60, tokens_per_minute: float = 500_000,
+                 max_concurrency: int = 4, max_queue: int = 32):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._active = 0
+        self._queue = []  # heap of (priority, seq, ticket)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            requests_per_minute=float(os.environ.get("MISTRAL_REQUESTS_PER_MINUTE", "60")),
+            tokens_per_minute=float(os.environ.get("MISTRAL_TOKENS_PER_MINUTE", "500000")),
+            max_concurrency=int(os.environ.get("MISTRAL_MAX_CONCURRENCY", "4")),
+            max_queue=int(os.environ.get("MISTRAL_MAX_QUEUE", "32")),
+        )
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    # --- internals, called with self._lock held ---
+
+    def _enqueue(self, tokens: int, priority: int) -> list:
+        if len(self._queue) >= self.max_queue:
+            raise QueueFullError()
+        ticket = [priority, next(self._seq), tokens]
+        heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _try_grant(self, ticket: list):
+        """0 if granted, seconds to wait for the buckets, or None to wait for a release"""
+        if self._queue[0] is not ticket or self._active >= self.max_concurrency:
+            return None
+        now = time.monotonic()
+        wait = max(self._requests.wait_time(1, now), self._tokens.wait_time(ticket[2], now))
+        if wait > 0:
+            return wait
+        self._requests.take(1)
+        self._tokens.take(ticket[2])
+        heapq.heappop(self._queue)
+        self._active += 1
+        self._cond.notify_all()  # the next ticket is now at the head
+        return 0
+
+    def _abandon(self, ticket: list) -> None:
+        """Remove a ticket that gave up waiting (cancelled or interrupted)"""
+        if ticket in self._queue:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+            self._cond.notify_all()
+
+    def _release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    # --- public API ---
+
+    @contextmanager
+    def acquire(self, tokens: int = 0, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None):
+        """
+        Block until the call may go upstream; hold a concurrency slot while inside.
+        Raises DeadlineExceeded if not granted within `timeout` seconds.
+        """
+        start = time.perf_counter()
+        give_up = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            ticket = self._enqueue(tokens, priority)
+            try:
+                while True:
+                    wait = self._try_grant(ticket)
+                    if wait == 0:
+                        break
+                    if give_up is not None:
+                        left = give_up - time.monotonic()
+                        if left <= 0:
+                            raise DeadlineExceeded()
+                        wait = left if wait is None else min(wait, left)
+                    self._cond.wait(timeout=wait)
+            except BaseException:
+                self._abandon(ticket)
+                raise
+        observe("queue_wait", time.perf_counter() - start, priority=priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def acquire_async(self, tokens: int = 0, priority: int = PRIORITY_INTERACTIVE,
+                            timeout: Optional[float] = None):
+        """Async variant of acquire: waits with asyncio.sleep, never blocks the loop"""
+        start = time.perf_counter()
+        give_up = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            ticket = self._enqueue(tokens, priority)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_grant(ticket)
+                if wait == 0:
+                    break
+                if give_up is not None and time.monotonic() >= give_up:
+                    raise DeadlineExceeded()
+                await asyncio.sleep(min(wait or POLL_INTERVAL, POLL_INTERVAL))
+        except BaseException:
+            with self._lock:
+                self._abandon(ticket)
+            raise
+        observe("queue_wait", time.perf_counter() - start, priority=priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+
+# Shared by every session in the process
+RATE_LIMITER = RateLimiter.from_env()
@@ -0,0 +1,68 @@
+# src/remote.py
+"""
+Client of the HTTP API (src/server.py), with the same interface as
+ask_agent_stream. The Streamlit app uses it instead of calling the model
+in-process when AGENT_API_URL is set.
+"""
+import json
+import os
+from typing import Iterator, Optional, Sequence
+
+from src.memory import ConversationMemory
+
+AGENT_API_URL = os.environ.get("AGENT_API_URL", "").rstrip("/")
+# Read timeout between two streamed chunks; the server enforces the overall deadline
+AGENT_API_TIMEOUT = float(os.environ.get("AGENT_API_TIMEOUT", "120"))
+
+_http = None
+
+
+def _client():
+    """One keep-alive HTTP client per process"""
+    global _http
+    if _http is None:
+        import httpx
+        _http = httpx.Client(base_url=AGENT_API_URL, timeout=httpx.Timeout(AGENT_API_TIMEOUT, connect=5.0))
+    return _http
+
+
+def remote_ask_stream(question: str, mode: str = "short", lang: Optional[str] = None,
+                      memory: Optional[ConversationMemory] = None, profile_id: Optional[str] = None,
+                      profile_keys: Optional[Sequence[str]] = None, max_tokens: Optional[int] = None,
+                      **kwargs) -> Iterator[str]:
+    """
+    Stream the answer from the server's /ask/stream endpoint.
+    Yields text chunks and returns the full answer; errors raise RuntimeError.
+    Extra keyword arguments (e.g. priority) only apply in-process and are ignored.
+    """
+    body = {"question": question, "mode": mode, "lang": lang, "profile": profile_id}
+    if memory is not None and len(memory):
+        body["memory"] = memory.to_dict()
+    if profile_keys is not None:
+        body["profile_keys"] = list(profile_keys)
+    if max_tokens is not None:
+        body["max_tokens"] = max_tokens
+    parts = []
+    event = None
+    with _client().stream("POST", "/ask/stream", json=body) as response:
+        if response.status_code != 200:
+            response.read()
+            try:
+                message = response.json().get("error")
+            except ValueError:
+                message = None
+            raise RuntimeError(message or f"Agent service error (HTTP {response.status_code}).")
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+                if event == "error":
+                    raise RuntimeError(data.get("error", "The agent service failed."))
+                if event == "done":
+                    break
+                parts.append(data["delta"])
+                yield data["delta"]
+            elif not line:
+                event = None
+    return "".join(parts).strip()
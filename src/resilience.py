@@ -0,0 +1,179 @@
+# src/resilience.py
+"""
+Bounds on the upstream calls, so an upstream incident cannot freeze a session.
+- Deadline: one time budget per request (REQUEST_DEADLINE_SHORT / _LONG)
+  covering the queue, every attempt, fallbacks and backoff. Each upstream
+  call gets what is left as its HTTP timeout, capped at ATTEMPT_TIMEOUT_SHORT
+  / _LONG so a hung model still leaves time to fall back to the next one.
+- CircuitBreaker: when the share of failed upstream calls among the recent
+  ones crosses BREAKER_ERROR_RATE, calls fail fast for BREAKER_COOLDOWN
+  seconds (cached and near-duplicate answers are still served), then one
+  probe call is let through; its success closes the circuit. Only 5xx and
+  connection errors or timeouts count as failures: 429s are left to backoff
+  and model fallback, and other 4xx errors come from the request.
+  Opening and closing are logged (logger "src.resilience") and counted.
+- Hedging (HEDGE_REQUESTS=1): an interactive, non-streamed call still running
+  after the observed p95 latency of its mode gets a second identical call;
+  the first answer wins. Streams are not hedged: chunks already shown cannot
+  be swapped for another call's.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from src.instrumentation import increment
+
+logger = logging.getLogger(__name__)
+
+# Settings (overridable from the environment)
+REQUEST_DEADLINE = {
+    "short": float(os.environ.get("REQUEST_DEADLINE_SHORT", "30")),
+    "long": float(os.environ.get("REQUEST_DEADLINE_LONG", "90")),
+}
+ATTEMPT_TIMEOUT = {
+    "short": float(os.environ.get("ATTEMPT_TIMEOUT_SHORT", "15")),
+    "long": float(os.environ.get("ATTEMPT_TIMEOUT_LONG", "60")),
+}
+BREAKER_ERROR_RATE = float(os.environ.get("BREAKER_ERROR_RATE", "0.5"))
+BREAKER_WINDOW = int(os.environ.get("BREAKER_WINDOW", "20"))  # recent calls considered
+BREAKER_MIN_CALLS = int(os.environ.get("BREAKER_MIN_CALLS", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", "30"))
+HEDGE_ENABLED = os.environ.get("HEDGE_REQUESTS", "0") == "1"
+HEDGE_MIN_SAMPLES = 20  # calls observed before the p95 is trusted
+HEDGE_MIN_DELAY = 0.5  # seconds
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised when a request runs out of its time budget"""
+
+    def __init__(self):
+        super().__init__("The request timed out. Please try again.")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the API while it is failing"""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"The model API is currently unavailable. Please try again in "
+                         f"{math.ceil(retry_in)} seconds.")
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def for_mode(cls, mode: str) -> "Deadline":
+        return cls(REQUEST_DEADLINE.get(mode, REQUEST_DEADLINE["long"]))
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def check(self) -> None:
+        if self.remaining() <= 0:
+            raise DeadlineExceeded()
+
+    def timeout_ms(self, mode: str) -> int:
+        """HTTP timeout of the next upstream attempt"""
+        self.check()
+        return max(1, int(min(self.remaining(), ATTEMPT_TIMEOUT.get(mode, ATTEMPT_TIMEOUT["long"])) * 1000))
+
+
+def transport_error_types() -> tuple:
+    """Connection errors and timeouts of the HTTP client, imported on first use"""
+    import httpx
+    return (httpx.TransportError,)
+
+
+class CircuitBreaker:
+    def __init__(self, error_rate: float = BREAKER_ERROR_RATE, window: int = BREAKER_WINDOW,
+                 min_calls: int = BREAKER_MIN_CALLS, cooldown: float = BREAKER_COOLDOWN):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._results = deque(maxlen=window)  # True for a failed call
+        self._open_until = 0.0  # 0 while closed
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._open_until > 0
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError while open; once the cooldown is over, let one probe call through"""
+        with self._lock:
+            if not self._open_until:
+                return
+            now = time.monotonic()
+            if now < self._open_until:
+                increment("breaker_rejections")
+                raise CircuitOpenError(self._open_until - now)
+            # Half-open: callers keep failing fast while this probe runs
+            self._open_until = now + self.cooldown
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._results.append(False)
+            if self._open_until:
+                self._open_until = 0.0
+                self._results.clear()
+                increment("breaker_transitions", state="closed")
+                logger.info("Model API answering again: circuit closed.")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._results.append(True)
+            if self._open_until:
+                self._open_until = time.monotonic() + self.cooldown  # the probe failed
+                return
+            failures = sum(self._results)
+            if len(self._results) >= self.min_calls and failures / len(self._results) >= self.error_rate:
+                self._open_until = time.monotonic() + self.cooldown
+                increment("breaker_transitions", state="open")
+                logger.warning("Model API failing (%d/%d calls): circuit open for %.0fs.",
+                               failures, len(self._results), self.cooldown)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "state": "open" if self._open_until else "closed",
+                "recent_calls": len(self._results),
+                "recent_failures": sum(self._results),
+                "open_for_seconds": max(0.0, round(self._open_until - time.monotonic(), 1)) if self._open_until else 0.0,
+            }
+
+
+class LatencyTracker:
+    """Recent non-streamed call durations per mode, for the hedging delay"""
+
+    def __init__(self, samples: int = 200):
+        self._samples: Dict[str, deque] = {}
+        self._size = samples
+        self._lock = threading.Lock()
+
+    def observe(self, mode: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(mode, deque(maxlen=self._size)).append(seconds)
+
+    def p95(self, mode: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(mode, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def hedge_delay(self, mode: str) -> Optional[float]:
+        """Seconds after which a call gets a hedge, or None (disabled or not enough data)"""
+        if not HEDGE_ENABLED:
+            return None
+        p95 = self.p95(mode)
+        return None if p95 is None else max(p95, HEDGE_MIN_DELAY)
+
+
+# Shared by every session in the process
+BREAKER = CircuitBreaker()
+LATENCIES = LatencyTracker()
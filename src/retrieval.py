@@ -0,0 +1,248 @@
+# src/retrieval.py
+"""
+Section-level retrieval over profile.json.
+
+The profile is split into chunks (one per top-level key, one per experience
+entry / recommendation) and indexed with a local BM25 index, built once per
+profile version. The system prompt is then assembled from the core identity fields,
+a compact index of every position (title, company, period) and the chunks most
+relevant to the question, within a token budget.
+
+Broad questions (career, work history, most recent job...) and questions whose
+best match scores below MIN_SCORE get the full profile instead: a few
+arbitrary chunks would answer them wrongly.
+"""
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.profile_loader import PROFILE_RULES, ProfileSnapshot, get_profile_snapshot
+from src.utils import estimate_tokens
+
+# Retrieval settings (overridable from the environment)
+RETRIEVAL_ENABLED = os.environ.get("PROFILE_RETRIEVAL", "1") != "0"
+TOP_K = int(os.environ.get("PROFILE_RETRIEVAL_TOP_K", "6"))
+TOKEN_BUDGET = int(os.environ.get("PROFILE_RETRIEVAL_TOKEN_BUDGET", "2500"))
+MIN_SCORE = float(os.environ.get("PROFILE_RETRIEVAL_MIN_SCORE", "2.0"))  # best BM25 score to trust
+
+# Fields sent with every prompt, whatever the question
+CORE_KEYS = [
+    "version", "name", "persona", "summary", "role", "location",
+    "answer_rules", "do_not_answer",
+]
+
+# List-valued sections indexed entry by entry
+SPLIT_KEYS = ["experience", "recommendations"]
+
+# Extra (mostly French) vocabulary so bilingual questions reach the right key
+KEY_ALIASES = {
+    "contact": "email mail phone telephone linkedin adresse address",
+    "nationalities": "nationality nationalite citizenship passport",
+    "languages": "language langue langues speak parle",
+    "age": "old born naissance ne",
+    "skills": "competences outils tools stack technologies",
+    "skill_clusters": "competences outils tools stack technologies",
+    "traits": "personality personnalite qualities qualites strengths forces",
+    "achievements_highlights": "achievements realisations impact results resultats",
+    "experience": "experience job role poste emploi worked travail mission",
+    "education": "formation diplome degree studies etudes university universite school",
+    "recommendations": "recommendation references colleague collegue manager",
+    "sample_questions": "example exemple",
+}
+
+# Questions about the whole career (accent-free, lowercase, matched as word prefixes)
+BROAD_QUESTION = re.compile(
+    r"\b(career|carriere|work history|job history|employment history|background|parcours|"
+    r"cv\b|resume|overview|summar|about yourself|presentez vous|present yourself|"
+    r"most recent|latest|current (job|role|position|employer)|dernier poste|poste actuel|"
+    r"all (of )?your (jobs|roles|positions|experiences)|previous (jobs|roles|positions)|"
+    r"every (job|role|position)|vos experiences|vos postes)"
+)
+
+# Fields of an experience entry kept in the index of positions
+INDEX_FIELDS = ("title", "company", "period")
+
+# Fields of an experience entry repeated in its indexed text, so that naming the
+# employer or the position outweighs the length of a long entry
+HEADING_FIELDS = ("title", "company")
+HEADING_WEIGHT = int(os.environ.get("PROFILE_RETRIEVAL_HEADING_WEIGHT", "3"))
+
+STOPWORDS = {
+    # English
+    "the", "and", "for", "you", "your", "are", "was", "were", "what", "how",
+    "did", "does", "can", "with", "that", "this", "have", "has", "from", "which",
+    "who", "about", "into", "its", "had", "any", "our", "their",
+    # French
+    "les", "des", "est", "une", "que", "qui", "quoi", "pour", "dans", "avec",
+    "sur", "par", "pas", "vous", "votre", "vos", "comment", "quel", "quelle",
+    "quels", "quelles", "ont", "aux", "ces", "son", "sont", "avez",
+}
+
+
+@dataclass
+class Chunk:
+    key: str
+    value: object
+    text: str
+    tokens: int
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip accents and split into indexable terms."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [t for t in re.findall(r"[a-z0-9]+", text) if len(t) > 1 and t not in STOPWORDS]
+
+
+def is_broad(question: str) -> bool:
+    """True for questions about the whole career rather than one topic"""
+    text = unicodedata.normalize("NFKD", question.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return BROAD_QUESTION.search(" ".join(re.findall(r"[a-z0-9]+", text))) is not None
+
+
+def experience_index(profile: dict) -> List[dict]:
+    """Title, company and period of every position, in profile order"""
+    return [
+        {field: entry[field] for field in INDEX_FIELDS if entry.get(field)}
+        for entry in profile.get("experience") or []
+        if isinstance(entry, dict) and entry.get("title")
+    ]
+
+
+def _dump(data) -> str:
+    return json.dumps(data, ensure_ascii=False, indent=1)
+
+
+def chunk_profile(profile: dict) -> List[Chunk]:
+    """Split the profile into retrievable chunks (core keys excluded)."""
+    chunks = []
+    for key, value in profile.items():
+        if key in CORE_KEYS:
+            continue
+        if key in SPLIT_KEYS and isinstance(value, list):
+            entries = value
+        else:
+            entries = [value]
+        for entry in entries:
+            text = _dump(entry)
+            chunks.append(Chunk(key, entry, text, estimate_tokens(text)))
+    return chunks
+
+
+class BM25Index:
+    """Minimal Okapi BM25 over pre-tokenized documents."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(doc) for doc in documents]
+        self.doc_lengths = [len(doc) for doc in documents]
+        self.avg_length = sum(self.doc_lengths) / max(len(documents), 1)
+        doc_freqs = Counter(term for tf in self.term_freqs for term in tf)
+        n = len(documents)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+
+    def scores(self, query: List[str]) -> List[float]:
+        results = []
+        for tf, length in zip(self.term_freqs, self.doc_lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length)
+            for term in query:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+        return results
+
+
+def _heading(chunk: Chunk) -> str:
+    """Title and company of an experience entry, HEADING_WEIGHT times ('' for other chunks)"""
+    if chunk.key != "experience" or not isinstance(chunk.value, dict):
+        return ""
+    heading = " ".join(str(chunk.value[field]) for field in HEADING_FIELDS if chunk.value.get(field))
+    return " ".join([heading] * HEADING_WEIGHT)
+
+
+def build_index(profile: dict) -> Tuple[List[Chunk], BM25Index]:
+    chunks = chunk_profile(profile)
+    documents = [
+        tokenize(f"{c.key.replace('_', ' ')} {KEY_ALIASES.get(c.key, '')} {_heading(c)} {c.text}")
+        for c in chunks
+    ]
+    return chunks, BM25Index(documents)
+
+
+def get_index(snapshot: ProfileSnapshot) -> Tuple[List[Chunk], BM25Index]:
+    """Chunks and BM25 index for a profile version, built once and reused."""
+    return snapshot.derived("bm25_index", build_index)
+
+
+def retrieve(question: str, top_k: int = TOP_K, snapshot: Optional[ProfileSnapshot] = None) -> List[Tuple[Chunk, float]]:
+    """Return up to top_k chunks with a positive BM25 score, best first."""
+    chunks, index = get_index(snapshot or get_profile_snapshot())
+    scores = index.scores(tokenize(question))
+    ranked = sorted(zip(chunks, scores), key=lambda pair: pair[1], reverse=True)
+    return [(chunk, score) for chunk, score in ranked[:top_k] if score > 0]
+
+
+def build_system_prompt(question: str, top_k: int = TOP_K, token_budget: int = TOKEN_BUDGET,
+                        snapshot: Optional[ProfileSnapshot] = None, keys: Optional[Sequence[str]] = None) -> str:
+    """
+    Build a compact system prompt for the question, from `snapshot`
+    (the default profile when omitted).
+    `keys` (profile fields) are sent in full, with the core fields, instead of
+    the sections retrieved for the question (e.g. one section of the CV).
+    Falls back to the full PROFILE_CONTEXT when retrieval is disabled, the
+    question is broad or nothing in the profile matches it well enough.
+    """
+    snapshot = snapshot or get_profile_snapshot()
+    if keys is not None:
+        profile = snapshot.data
+        return _profile_prompt(profile, {k: profile[k] for k in dict.fromkeys([*CORE_KEYS, *keys]) if k in profile})
+    if not RETRIEVAL_ENABLED or is_broad(question):
+        return snapshot.context
+    hits = retrieve(question, top_k, snapshot)
+    if not hits or hits[0][1] < MIN_SCORE:
+        return snapshot.context
+
+    profile = snapshot.data
+    chunks, _ = get_index(snapshot)
+    selected: Dict[str, object] = {k: profile[k] for k in CORE_KEYS if k in profile}
+    # Every position at a glance, whichever entries are retrieved in full
+    positions = snapshot.derived("experience_index", experience_index)
+    if positions:
+        selected["experience_index"] = positions
+    used = estimate_tokens(_dump(selected)) + estimate_tokens(PROFILE_RULES)
+    picked = []
+    for chunk, _ in hits:
+        if used + chunk.tokens > token_budget:
+            continue
+        picked.append(chunk)
+        used += chunk.tokens
+
+    # Keep the original profile order, regrouping split entries under their key
+    order = {id(c): i for i, c in enumerate(chunks)}
+    for chunk in sorted(picked, key=lambda c: order[id(c)]):
+        if chunk.key in SPLIT_KEYS:
+            selected.setdefault(chunk.key, []).append(chunk.value)
+        else:
+            selected[chunk.key] = chunk.value
+
+    return _profile_prompt(profile, selected)
+
+
+def _profile_prompt(profile: dict, selected: Dict[str, object]) -> str:
+    return (
+        f"\nYou are {profile.get('name', 'the candidate')}. "
+        "Always follow the profile strictly. Relevant profile sections:\n"
+        f"{_dump(selected)}\n{PROFILE_RULES}"
+    )
@@ -0,0 +1,68 @@
+# src/retry.py
+"""
+Retry policy shared by the sync and async Mistral calls.
+Rate-limited (429) requests are retried with exponential backoff and jitter,
+honoring the Retry-After header when the API sends one.
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+MAX_RETRIES = 5
+BACKOFF = 2  # seconds, doubled on every attempt
+MAX_BACKOFF = 30  # seconds
+
+
+def api_error_type() -> type:
+    """SDK error class, imported on first use so that importing src stays cheap"""
+    from mistralai.models import SDKError
+    return SDKError
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True if the SDK error is an HTTP 429"""
+    return getattr(error, "status_code", None) == 429 or "Status 429" in str(error)
+
+
+def is_server_failure(error: Exception) -> bool:
+    """
+    True if the API itself failed: a 5xx, or no HTTP status at all (connection
+    error, timeout). 4xx errors come from the request and say nothing about the API.
+    """
+    status = getattr(error, "status_code", None)
+    return status is None or status >= 500
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by the Retry-After header, if any"""
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        raw_response = getattr(error, "raw_response", None)
+        headers = getattr(raw_response, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying after `error` on attempt number `attempt`
+    (0-based), or None if the request should not be retried.
+    """
+    if not is_rate_limited(error) or attempt >= MAX_RETRIES - 1:
+        return None
+    requested = retry_after(error)
+    if requested is not None:
+        return min(requested, MAX_BACKOFF)
+    # Equal jitter: half fixed, half random, so concurrent callers spread out
+    base = min(BACKOFF * (2 ** attempt), MAX_BACKOFF)
+    return base / 2 + random.uniform(0, base / 2)
@@ -0,0 +1,180 @@
+# src/routing.py
+"""
+Model routing per answer mode.
+Each mode has a chain of models: the first is the preferred one, the others
+are fallbacks tried when it is rate-limited or failing. Every route
+(mode, model) tracks an exponential moving average of its latency (the whole
+call, or the time to the first token of a stream); a route that gets a 429,
+a 5xx or a connection error, or becomes slower than its mode's threshold, is
+demoted (moved to the end of the chain) for a cooldown, then tried again.
+Other 4xx errors come from the request and do not demote the model.
+
+Configuration (later sources win):
+1. defaults below
+2. a TOML file (MODEL_ROUTES_PATH, default models.toml at the project root):
+       [routes]
+       short = ["mistral-small-latest", "mistral-medium"]
+       long = ["mistral-medium", "mistral-small-latest"]
+       [slow_seconds]
+       short = 8
+       long = 45
+       [health]
+       demote_seconds = 60
+3. environment: MODEL_ROUTE_SHORT / MODEL_ROUTE_LONG (comma-separated),
+   MODEL_SLOW_SECONDS_SHORT / MODEL_SLOW_SECONDS_LONG, MODEL_DEMOTE_SECONDS
+An empty route keeps the default chain of its mode.
+"""
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.instrumentation import increment
+from src.retry import is_rate_limited, is_server_failure, retry_after
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[1]
+ROUTES_PATH = Path(os.environ.get("MODEL_ROUTES_PATH", ROOT / "models.toml"))
+
+DEFAULT_ROUTES = {
+    "short": ["mistral-small-latest", "mistral-medium"],
+    "long": ["mistral-medium", "mistral-small-latest"],
+}
+# Average call duration above which a route is demoted
+DEFAULT_SLOW_SECONDS = {"short": 8.0, "long": 45.0}
+DEFAULT_DEMOTE_SECONDS = 60.0
+EWMA_ALPHA = 0.3  # weight of the latest call in the moving average
+
+
+def _load_toml(path: Path) -> dict:
+    """Parsed TOML file, or {} when it does not exist"""
+    if not path.is_file():
+        return {}
+    try:
+        import tomllib  # Python 3.11+
+    except ImportError:
+        import tomli as tomllib  # pip install tomli on older Pythons
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+class _RouteHealth:
+    __slots__ = ("latency", "demoted_until", "calls", "failures")
+
+    def __init__(self):
+        self.latency: Optional[float] = None  # moving average, seconds
+        self.demoted_until = 0.0
+        self.calls = 0
+        self.failures = 0
+
+
+class ModelRouter:
+    def __init__(self, routes: Dict[str, List[str]], slow_seconds: Dict[str, float],
+                 demote_seconds: float = DEFAULT_DEMOTE_SECONDS):
+        self.routes = {mode: list(models) for mode, models in routes.items() if models}
+        self.slow_seconds = slow_seconds
+        self.demote_seconds = demote_seconds
+        self._health: Dict[Tuple[str, str], _RouteHealth] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path: Path = ROUTES_PATH) -> "ModelRouter":
+        config = _load_toml(path)
+        routes = {**DEFAULT_ROUTES, **{mode: models for mode, models in config.get("routes", {}).items() if models}}
+        slow = {**DEFAULT_SLOW_SECONDS, **config.get("slow_seconds", {})}
+        demote = float(config.get("health", {}).get("demote_seconds", DEFAULT_DEMOTE_SECONDS))
+        for mode in list(routes):
+            chain = os.environ.get(f"MODEL_ROUTE_{mode.upper()}", "")
+            models = [model.strip() for model in chain.split(",") if model.strip()]
+            if models:
+                routes[mode] = models
+            seconds = os.environ.get(f"MODEL_SLOW_SECONDS_{mode.upper()}")
+            if seconds:
+                slow[mode] = float(seconds)
+        demote = float(os.environ.get("MODEL_DEMOTE_SECONDS", demote))
+        return cls(routes, {mode: float(value) for mode, value in slow.items()}, demote)
+
+    def primary(self, mode: str) -> str:
+        """Preferred model of a mode; identifies the mode's answers in the caches"""
+        return self.routes[mode][0]
+
+    def signature(self) -> str:
+        """Preferred model per mode, e.g. "long=mistral-medium,short=mistral-small-latest" """
+        return ",".join(f"{mode}={self.primary(mode)}" for mode in sorted(self.routes))
+
+    def _route(self, mode: str, model: str) -> _RouteHealth:
+        health = self._health.get((mode, model))
+        if health is None:
+            health = self._health[(mode, model)] = _RouteHealth()
+        return health
+
+    def candidates(self, mode: str) -> List[str]:
+        """Models to try in order: healthy routes first, then demoted ones (soonest back first)"""
+        now = time.monotonic()
+        with self._lock:
+            chain = self.routes[mode]
+            until = {model: self._route(mode, model).demoted_until for model in chain}
+        healthy = [model for model in chain if until[model] <= now]
+        demoted = sorted((model for model in chain if until[model] > now), key=until.get)
+        return healthy + demoted
+
+    def _demote(self, mode: str, model: str, health: _RouteHealth, seconds: float, reason: str) -> None:
+        """Called with the lock held; a single-model chain has nothing to fall back to"""
+        if len(self.routes[mode]) < 2:
+            return
+        health.demoted_until = time.monotonic() + seconds
+        health.latency = None  # measured afresh once the route is back
+        increment("model_demotions", model=model, mode=mode, reason=reason)
+        logger.warning("Model %s demoted for %s answers for %.0fs (%s).", model, mode, seconds, reason)
+
+    def record_success(self, mode: str, model: str, seconds: float) -> None:
+        with self._lock:
+            health = self._route(mode, model)
+            health.calls += 1
+            if health.latency is None:
+                health.latency = seconds
+            else:
+                health.latency += EWMA_ALPHA * (seconds - health.latency)
+            slow = self.slow_seconds.get(mode)
+            if slow and health.latency > slow:
+                self._demote(mode, model, health, self.demote_seconds, "slow")
+            else:
+                health.demoted_until = 0.0  # answering again in time: back in its place
+
+    def record_failure(self, mode: str, model: str, error: Exception) -> None:
+        """Demote a rate-limited or failing route (for Retry-After seconds when given)"""
+        requested = retry_after(error)
+        with self._lock:
+            health = self._route(mode, model)
+            health.calls += 1
+            if not is_rate_limited(error) and not is_server_failure(error):
+                return  # a bad request: another model would reject it too
+            health.failures += 1
+            reason = "rate_limited" if is_rate_limited(error) else "error"
+            self._demote(mode, model, health, max(requested or 0.0, self.demote_seconds), reason)
+
+    def status(self) -> Dict[str, List[dict]]:
+        """Per-mode routes with their health, e.g. for a health endpoint"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                mode: [
+                    {
+                        "model": model,
+                        "latency_seconds": health.latency,
+                        "calls": health.calls,
+                        "failures": health.failures,
+                        "demoted_for_seconds": max(0.0, round(health.demoted_until - now, 1)),
+                    }
+                    for model in chain
+                    for health in [self._route(mode, model)]
+                ]
+                for mode, chain in self.routes.items()
+            }
+
+
+# Shared by every session in the process
+ROUTER = ModelRouter.from_config()
@@ -0,0 +1,256 @@
+# src/semantic_cache.py
+"""
+Near-duplicate answer reuse.
+Rephrased questions ("Can you describe how you built the Top Prospect Model
+at IFM and the measurable impact it had?" / "How did you build the Top
+Prospect Model at IFM, and what was its impact?") miss the exact-match
+response cache. Questions answered before are embedded locally with a hashed
+character n-gram TF-IDF over their content words (no network, no model
+download), kept in one NumPy matrix per (profile, language, mode, model)
+partition, and a new question reuses the answer of its most similar stored
+question when:
+- the cosine similarity reaches SEMANTIC_THRESHOLD, and
+- both questions name the same key terms: tools, companies and roles of the
+  profile, role words, and capitalized names or acronyms. "Power BI at Lidl"
+  never gets the "Power BI at IFM" answer, nor "SQL" the "Python" one.
+
+The index lives in memory, is seeded with the precomputed answers
+(src/answer_store.py); a profile's partitions are cleared when it changes.
+"""
+import os
+import re
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from src.answer_store import get_answer_store
+from src.cache import normalize_question
+from src.profile_loader import MAX_ACTIVE_PROFILES, ProfileSnapshot, get_profile_snapshot
+from src.retrieval import STOPWORDS
+from src.routing import ROUTER
+
+# Settings (overridable from the environment)
+SEMANTIC_ENABLED = os.environ.get("SEMANTIC_CACHE", "1") != "0"
+SEMANTIC_THRESHOLD = float(os.environ.get("SEMANTIC_THRESHOLD", "0.72"))
+MAX_ENTRIES = int(os.environ.get("SEMANTIC_MAX_ENTRIES", "1000"))  # per partition
+
+DIM = 2 ** 12  # hashed feature space (16 KB per stored question)
+NGRAM_SIZES = (3, 4, 5)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Words that say how to answer, not what about (on top of the retrieval stopwords)
+FILLER_WORDS = STOPWORDS | {
+    "is", "do", "be", "an", "of", "in", "on", "at", "to", "me", "my", "it", "or", "so", "i",
+    "would", "could", "tell", "describe", "explain", "talk", "give", "share", "please",
+    "le", "la", "de", "du", "et", "en", "au", "ce", "il", "je", "ou", "se",
+    "pouvez", "pourriez", "parlez", "decrire", "decrivez", "expliquez", "moi", "chez",
+}
+
+# Role words that make two otherwise identical questions different
+ROLE_TERMS = {
+    "analyst", "analyste", "engineer", "ingenieur", "scientist", "developer", "developpeur",
+    "manager", "consultant", "architect", "architecte", "intern", "stagiaire", "director",
+    "directeur", "lead", "owner", "instructor", "formateur", "founder", "fondateur",
+}
+
+
+def _strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", text) if not unicodedata.combining(c))
+
+
+def _term(word: str) -> str:
+    """Comparable form of a word: lowercase, no accents, no plural s"""
+    word = _strip_accents(word.lower())
+    return word[:-1] if len(word) > 3 and word.endswith("s") else word
+
+
+def content_words(question: str) -> List[str]:
+    """Words of a question without the filler words (all of them if nothing is left)"""
+    words = _WORD_RE.findall(_strip_accents(normalize_question(question)))
+    return [word for word in words if word not in FILLER_WORDS] or words
+
+
+def profile_terms(profile: dict) -> FrozenSet[str]:
+    """Tool, company and role words of a profile"""
+    names = list(profile.get("skills") or [])
+    for cluster in (profile.get("skill_clusters") or {}).values():
+        names += cluster if isinstance(cluster, list) else []
+    for entry in profile.get("experience") or []:
+        if isinstance(entry, dict):
+            names += [entry.get("title") or "", re.split(r"[—(]", entry.get("company") or "")[0]]
+    return frozenset(_term(word) for name in names for word in _WORD_RE.findall(str(name))
+                     if _term(word) not in FILLER_WORDS and len(word) > 1)
+
+
+def key_terms(question: str, vocabulary: FrozenSet[str]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    (key terms, all terms) of a question. Key terms are profile and role words,
+    acronyms, words with digits and capitalized words past the first one.
+    """
+    words = _WORD_RE.findall(question)
+    terms = frozenset(_term(word) for word in words)
+    keys = frozenset(
+        _term(word) for i, word in enumerate(words)
+        if _term(word) in vocabulary or _term(word) in ROLE_TERMS or any(c.isdigit() for c in word)
+        or any(c.isupper() for c in word[1:]) or (i and word[0].isupper())
+    )
+    return keys - FILLER_WORDS, terms
+
+
+def ngram_counts(question: str) -> np.ndarray:
+    """Hashed character n-gram counts of a question's content words (padded with spaces)"""
+    vector = np.zeros(DIM, dtype=np.float32)
+    for word in content_words(question):
+        padded = f" {word} "
+        for n in NGRAM_SIZES:
+            for i in range(max(1, len(padded) - n + 1)):
+                vector[zlib.crc32(padded[i:i + n].encode("utf-8")) % DIM] += 1
+    # Sublinear term frequency
+    np.log1p(vector, out=vector)
+    return vector
+
+
+class _Partition:
+    """Stored questions of one (lang, mode, model) with their answers"""
+
+    def __init__(self):
+        self.counts = np.zeros((16, DIM), dtype=np.float32)  # sublinear tf, one row per question
+        self.size = 0
+        self.answers: List[str] = []
+        self.terms: List[Tuple[FrozenSet[str], FrozenSet[str]]] = []  # key_terms() per row
+        self.questions: Dict[str, int] = {}  # normalized question -> row
+        self._weighted = None  # L2-normalized TF-IDF rows, rebuilt after an insert
+        self._idf = None
+
+    def add(self, question: str, answer: str, vocabulary: FrozenSet[str]) -> None:
+        normalized = normalize_question(question)
+        if normalized in self.questions:
+            return
+        if self.size >= MAX_ENTRIES:
+            self._drop_oldest(max(1, self.size // 4))
+        if self.size == len(self.counts):  # grow the matrix geometrically
+            self.counts = np.vstack([self.counts, np.zeros_like(self.counts)])
+        self.counts[self.size] = ngram_counts(question)
+        self.questions[normalized] = self.size
+        self.answers.append(answer)
+        self.terms.append(key_terms(question, vocabulary))
+        self.size += 1
+        self._weighted = None
+
+    def _drop_oldest(self, n: int) -> None:
+        self.counts[:self.size - n] = self.counts[n:self.size]
+        self.counts[self.size - n:self.size] = 0
+        self.size -= n
+        del self.answers[:n]
+        del self.terms[:n]
+        self.questions = {q: row - n for q, row in self.questions.items() if row >= n}
+
+    def _matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._weighted is None:
+            counts = self.counts[:self.size]
+            df = np.count_nonzero(counts, axis=0)
+            self._idf = (np.log((1 + self.size) / (1 + df)) + 1).astype(np.float32)
+            self._weighted = _normalize(counts * self._idf)
+        return self._weighted, self._idf
+
+    def best_matches(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(row, cosine similarity) of the nearest stored question for each query row"""
+        matrix, idf = self._matrix()
+        scores = _normalize(queries * idf) @ matrix.T
+        rows = scores.argmax(axis=1)
+        return rows, scores[np.arange(len(rows)), rows]
+
+    def same_key_terms(self, row: int, terms: Tuple[FrozenSet[str], FrozenSet[str]]) -> bool:
+        """True when each question mentions every key term of the other"""
+        keys, words = terms
+        stored_keys, stored_words = self.terms[row]
+        return keys <= stored_words and stored_keys <= words
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SemanticCache:
+    """Partitions grouped by profile; at most MAX_ACTIVE_PROFILES profiles are kept"""
+
+    def __init__(self, threshold: float = SEMANTIC_THRESHOLD, max_profiles: int = MAX_ACTIVE_PROFILES):
+        self.threshold = threshold
+        self.max_profiles = max(1, max_profiles)
+        # profile_id -> (profile_hash, {(lang, mode, model): partition}), least recently used first
+        self._profiles: "OrderedDict[str, Tuple[str, Dict[Tuple[str, str, str], _Partition]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _partitions(self, snapshot: ProfileSnapshot) -> Dict[Tuple[str, str, str], _Partition]:
+        """
+        Partitions of the snapshot's profile (called with the lock held).
+        Answers built from an older version of the profile are dropped.
+        """
+        entry = self._profiles.get(snapshot.profile_id)
+        if entry is None or entry[0] != snapshot.profile_hash:
+            entry = self._profiles[snapshot.profile_id] = (snapshot.profile_hash, {})
+        self._profiles.move_to_end(snapshot.profile_id)
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        return entry[1]
+
+    def add(self, question: str, answer: str, lang: str, mode: str, model: str,
+            snapshot: Optional[ProfileSnapshot] = None) -> None:
+        if not answer:
+            return
+        snapshot = snapshot or get_profile_snapshot()
+        vocabulary = snapshot.derived("semantic_terms", profile_terms)
+        with self._lock:
+            self._partitions(snapshot).setdefault((lang, mode, model), _Partition()).add(question, answer, vocabulary)
+
+    def lookup_many(self, questions: List[str], lang: str, mode: str, model: str,
+                    snapshot: Optional[ProfileSnapshot] = None) -> List[Optional[str]]:
+        """Batched top-1: the stored answer for each question, or None (below the threshold, other key terms)"""
+        snapshot = snapshot or get_profile_snapshot()
+        vocabulary = snapshot.derived("semantic_terms", profile_terms)
+        with self._lock:
+            partition = self._partitions(snapshot).get((lang, mode, model))
+            if partition is None or not partition.size or not questions:
+                return [None] * len(questions)
+            queries = np.vstack([ngram_counts(question) for question in questions])
+            rows, scores = partition.best_matches(queries)
+            return [partition.answers[row]
+                    if score >= self.threshold and partition.same_key_terms(row, key_terms(question, vocabulary))
+                    else None
+                    for question, row, score in zip(questions, rows, scores)]
+
+    def lookup(self, question: str, lang: str, mode: str, model: str,
+               snapshot: Optional[ProfileSnapshot] = None) -> Optional[str]:
+        return self.lookup_many([question], lang, mode, model, snapshot)[0]
+
+    def __len__(self) -> int:
+        return sum(partition.size for _, partitions in self._profiles.values()
+                   for partition in partitions.values())
+
+
+# Shared by every session in the process, built on first use
+_semantic_cache = None
+_semantic_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """The process-wide index (seeded with the precomputed answers), or None when disabled"""
+    global _semantic_cache
+    if SEMANTIC_ENABLED and _semantic_cache is None:
+        with _semantic_lock:
+            if _semantic_cache is None:
+                index = SemanticCache()
+                store = get_answer_store()
+                if store is not None:
+                    for entry in store.answers.values():
+                        index.add(entry["question"], entry["answer"], entry["lang"], entry["mode"],
+                                  ROUTER.primary(entry["mode"]))
+                _semantic_cache = index
+    return _semantic_cache
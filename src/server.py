@@ -0,0 +1,232 @@
+# src/server.py
+"""
+Headless HTTP API for the agent (ASGI, Starlette + uvicorn).
+
+Endpoints:
+- POST /ask          : {"question", "mode"?, "lang"?, "memory"?, "profile"?,
+                        "profile_keys"?, "max_tokens"?} -> {"answer"}
+- POST /ask/stream   : same body, answer as server-sent events
+                       ("data: {"delta": ...}" per chunk, then "event: done")
+- GET  /health       : liveness, default profile version, model route health and circuit state
+- GET  /profiles     : servable and currently loaded profile ids
+- GET  /metrics      : Prometheus text (when AGENT_METRICS=1)
+
+`memory` is the conversation state returned by ConversationMemory.to_dict(),
+so the server itself stays stateless. `profile` selects the candidate (a
+file of PROFILES_DIR, see ProfileRegistry); the default profile if omitted.
+`profile_keys` (profile fields sent instead of the retrieved ones) and
+`max_tokens` (up to AGENT_MAX_TOKENS) are used for the sections of a CV.
+Each worker process has its own pooled keep-alive upstream client
+(src/profile_loader.py), rate limiter, caches and loaded profiles.
+
+Usage:
+    pip install -e ".[server]"
+    llm-profile-server --workers 4 --timeout 60   # or: python -m src.server
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.agent import aask_agent, aask_agent_stream
+from src.answer_store import get_answer_store
+from src.llm_wrapper import MODE_INSTRUCTIONS
+from src.memory import ConversationMemory
+from src.resilience import BREAKER, DeadlineExceeded
+from src.routing import ROUTER
+from src import instrumentation, profile_loader
+
+# Seconds allowed for a whole request (queueing, retries and generation)
+REQUEST_TIMEOUT = float(os.environ.get("AGENT_REQUEST_TIMEOUT", "60"))
+MAX_QUESTION_CHARS = int(os.environ.get("AGENT_MAX_QUESTION_CHARS", "20000"))
+MAX_TOKENS_LIMIT = int(os.environ.get("AGENT_MAX_TOKENS", "4000"))  # largest max_tokens a client may ask for
+
+
+def _is_memory(memory) -> bool:
+    """True for the shape of ConversationMemory.to_dict()"""
+    if not isinstance(memory, dict):
+        return False
+    summary, turns = memory.get("summary", []), memory.get("turns", [])
+    return (isinstance(summary, list) and all(isinstance(line, str) for line in summary)
+            and isinstance(turns, list)
+            and all(isinstance(turn, list) and len(turn) == 2 and all(isinstance(part, str) for part in turn)
+                    for turn in turns))
+
+
+async def _parse(request: Request) -> dict:
+    """Validated ask_agent keyword arguments from the JSON body"""
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ValueError("Body must be JSON.") from None
+    if not isinstance(body, dict):
+        raise ValueError("Body must be a JSON object.")
+    question = body.get("question")
+    if not isinstance(question, str) or not question.strip():
+        raise ValueError("'question' must be a non-empty string.")
+    if len(question) > MAX_QUESTION_CHARS:
+        raise ValueError(f"'question' is longer than {MAX_QUESTION_CHARS} characters.")
+    profile_id = body.get("profile")
+    if profile_id is not None and not isinstance(profile_id, str):
+        raise ValueError("'profile' must be a string.")
+    if profile_id is not None:
+        profile_loader.get_profile_registry().path(profile_id)  # unknown: ValueError before streaming
+    mode = body.get("mode", "short")
+    if not isinstance(mode, str) or mode not in MODE_INSTRUCTIONS:
+        raise ValueError(f"'mode' must be one of: {', '.join(MODE_INSTRUCTIONS)}.")
+    lang = body.get("lang")
+    if lang is not None and not isinstance(lang, str):
+        raise ValueError("'lang' must be a string.")
+    memory = body.get("memory")
+    if memory is not None and not _is_memory(memory):
+        raise ValueError("'memory' must be an object with a 'summary' list of strings "
+                         "and a 'turns' list of [question, answer] string pairs.")
+    profile_keys = body.get("profile_keys")
+    if profile_keys is not None and (not isinstance(profile_keys, list)
+                                     or not all(isinstance(key, str) for key in profile_keys)):
+        raise ValueError("'profile_keys' must be a list of strings.")
+    max_tokens = body.get("max_tokens")
+    if max_tokens is not None and (not isinstance(max_tokens, int) or isinstance(max_tokens, bool)
+                                   or not 0 < max_tokens <= MAX_TOKENS_LIMIT):
+        raise ValueError(f"'max_tokens' must be an integer between 1 and {MAX_TOKENS_LIMIT}.")
+    return {
+        "question": question,
+        "mode": mode,
+        "lang": lang,
+        "memory": ConversationMemory.from_dict(memory) if memory else None,
+        "profile_id": profile_id,
+        "profile_keys": profile_keys,
+        "max_tokens": max_tokens,
+    }
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def _sse(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def ask(request: Request):
+    try:
+        kwargs = await _parse(request)
+        answer = await asyncio.wait_for(aask_agent(**kwargs), REQUEST_TIMEOUT)
+    except ValueError as e:  # bad body, invalid mode or unknown profile
+        return _error(400, str(e))
+    except (asyncio.TimeoutError, DeadlineExceeded):
+        return _error(504, "The request timed out.")
+    except RuntimeError as e:  # API overloaded or failing, or request queue full
+        return _error(503, str(e))
+    return JSONResponse({"answer": answer})
+
+
+async def ask_stream(request: Request):
+    try:
+        kwargs = await _parse(request)
+    except ValueError as e:
+        return _error(400, str(e))
+
+    async def events():
+        chunks = aask_agent_stream(**kwargs)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REQUEST_TIMEOUT
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                try:
+                    delta = await asyncio.wait_for(chunks.__anext__(), remaining)
+                except StopAsyncIteration:
+                    break
+                yield _sse({"delta": delta})
+            yield _sse({}, event="done")
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            yield _sse({"error": "The request timed out."}, event="error")
+        except (ValueError, RuntimeError) as e:
+            yield _sse({"error": str(e)}, event="error")
+        finally:
+            await chunks.aclose()
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def health(request: Request):
+    snapshot = profile_loader.get_profile_snapshot()
+    return JSONResponse({"status": "ok", "profile_version": snapshot.profile_hash, "routes": ROUTER.status(),
+                         "circuit": BREAKER.status()})
+
+
+async def profiles(request: Request):
+    registry = profile_loader.get_profile_registry()
+    return JSONResponse({"profiles": registry.profile_ids(), "active": registry.active()})
+
+
+async def metrics(request: Request):
+    if not instrumentation.ENABLED:
+        return _error(404, "Metrics are disabled (set AGENT_METRICS=1).")
+    return PlainTextResponse(instrumentation.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Fail fast on a missing key, and open the pooled client before the first request
+    profile_loader.init()
+    get_answer_store()
+    yield
+    client = profile_loader.get_client()
+    for name in ("async_client", "client"):
+        http = getattr(getattr(client, "sdk_configuration", None), name, None)
+        close = getattr(http, "aclose", None) or getattr(http, "close", None)
+        if close is not None:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+app = Starlette(
+    routes=[
+        Route("/ask", ask, methods=["POST"]),
+        Route("/ask/stream", ask_stream, methods=["POST"]),
+        Route("/health", health, methods=["GET"]),
+        Route("/profiles", profiles, methods=["GET"]),
+        Route("/metrics", metrics, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.environ.get("AGENT_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("AGENT_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("AGENT_WORKERS", "1")),
+                        help="worker processes (each with its own connection pool and rate limiter)")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="per-request timeout (s)")
+    parser.add_argument("--keepalive", type=int, default=5, help="idle client connection timeout (s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    import uvicorn
+
+    args = parse_args(argv)
+    # Read by every worker process when it imports this module
+    os.environ["AGENT_REQUEST_TIMEOUT"] = str(args.timeout)
+    uvicorn.run("src.server:app", host=args.host, port=args.port, workers=args.workers,
+                timeout_keep_alive=args.keepalive)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# src/singleflight.py
+"""
+Request coalescing ("single-flight") for identical in-flight questions.
+Concurrent callers with the same key share one upstream call and all
+receive its result - for blocking, async and streaming calls.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Generator, Iterator, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Broadcast:
+    """Pumps one upstream generator in a background thread and replays it to every subscriber"""
+
+    def __init__(self, source: Generator, on_done: Callable[[], None]):
+        self.chunks = []
+        self.finished = False
+        self.result = None
+        self.error = None
+        self._cond = threading.Condition()
+        self._source = source
+        self._on_done = on_done
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self) -> None:
+        try:
+            while True:
+                chunk = next(self._source)
+                with self._cond:
+                    self.chunks.append(chunk)
+                    self._cond.notify_all()
+        except StopIteration as stop:
+            self.result = stop.value
+        except BaseException as e:
+            self.error = e
+        # Later callers start a new flight (or hit the response cache)
+        self._on_done()
+        with self._cond:
+            self.finished = True
+            self._cond.notify_all()
+
+    def subscribe(self) -> Iterator[str]:
+        """Yield every chunk from the start; return the source's return value"""
+        seen = 0
+        while True:
+            with self._cond:
+                while seen >= len(self.chunks) and not self.finished:
+                    self._cond.wait()
+                new_chunks = self.chunks[seen:]
+                finished = self.finished
+            seen += len(new_chunks)
+            yield from new_chunks
+            if finished and seen >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return self.result
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], list] = {}  # -> [task, waiter count]
+        self._streams: Dict[str, _Broadcast] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn() once for all concurrent callers using the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of do(). Cancelling one caller does not cancel the upstream
+        call others are waiting on; it is only cancelled when every caller gave up.
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            entry = self._tasks.get(task_key)
+            if entry is None:
+                task = asyncio.ensure_future(coro_fn())
+                entry = self._tasks[task_key] = [task, 0]
+                task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+            entry[1] += 1
+        task = entry[0]
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if entry[1] == 1:
+                task.cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def stream(self, key: str, gen_fn: Callable[[], Generator]) -> Iterator[str]:
+        """Share one streaming generator; every caller gets all chunks from the start"""
+        with self._lock:
+            broadcast = self._streams.get(key)
+            if broadcast is None:
+                broadcast = self._streams[key] = _Broadcast(
+                    gen_fn(), on_done=lambda: self._drop_stream(key)
+                )
+        return broadcast.subscribe()
+
+    def _drop_stream(self, key: str) -> None:
+        with self._lock:
+            self._streams.pop(key, None)
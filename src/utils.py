@@ -10,3 +10,14 @@ def save_json(path: Path, data: dict) -> None:
     """Save Python dict into a JSON file."""
     with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+def join_items(items, last: str) -> str:
+    """Join non-empty items as a sentence list ("a, b and c"), `last` being the final conjunction."""
+    items = [str(item) for item in items if item]
+    if len(items) <= 1:
+        return "".join(items)
+    return f"{', '.join(items[:-1])} {last} {items[-1]}"
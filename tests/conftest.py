@@ -0,0 +1,42 @@
+# tests/conftest.py
+"""
+Offline test setup: every test runs against FakeMistral, without an API key
+and without the shared on-disk caches. Tests that need a store build their
+own in tmp_path.
+"""
+import os
+
+# Before anything from src is imported: module-level settings read these
+os.environ["MISTRAL_FAKE"] = "1"
+os.environ.setdefault("MISTRAL_API_KEY", "test")
+os.environ["RESPONSE_CACHE"] = "0"
+os.environ["SEMANTIC_CACHE"] = "0"
+os.environ["ANSWER_STORE"] = "0"
+os.environ["AGENT_METRICS"] = "0"
+
+import pytest  # noqa: E402
+
+from src import profile_loader  # noqa: E402
+from src.fake_client import FakeMistral  # noqa: E402
+from src.resilience import BREAKER  # noqa: E402
+from src.routing import ROUTER  # noqa: E402
+
+
+@pytest.fixture
+def snapshot():
+    """The default profile (data/profile.json)"""
+    return profile_loader.get_profile_snapshot()
+
+
+@pytest.fixture
+def fake_client():
+    """An instant FakeMistral, with the route health and circuit reset around the test"""
+    client = FakeMistral(latency=0.0, tokens_per_second=1e6, completion_tokens=20)
+    profile_loader.init(client=client)
+    ROUTER._health.clear()
+    BREAKER._results.clear()
+    BREAKER._open_until = 0.0
+    yield client
+    ROUTER._health.clear()
+    BREAKER._results.clear()
+    BREAKER._open_until = 0.0
@@ -0,0 +1,49 @@
+import time
+
+from src.cache import ResponseCache, make_key, normalize_question
+
+
+def test_normalize_question():
+    assert normalize_question("  What  IS your\tName? ") == "what is your name?"
+
+
+def test_key_depends_on_every_setting():
+    base = make_key("Question?", "short", "model-a", lang="en", profile_version="v1")
+    assert base == make_key("  question? ", "short", "model-a", lang="en", profile_version="v1")
+    assert base != make_key("Question?", "long", "model-a", lang="en", profile_version="v1")
+    assert base != make_key("Question?", "short", "model-b", lang="en", profile_version="v1")
+    assert base != make_key("Question?", "short", "model-a", lang="fr", profile_version="v1")
+    assert base != make_key("Question?", "short", "model-a", lang="en", profile_version="v2")
+    assert base != make_key("Question?", "short", "model-a", lang="en", context="abc", profile_version="v1")
+
+
+def test_get_set_and_persistence(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path)
+    assert cache.get("k") is None
+    cache.set("k", "answer")
+    assert cache.get("k") == "answer"
+    # Read back from disk by a new process-level cache
+    assert ResponseCache(path).get("k") == "answer"
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0.05)
+    cache.set("k", "answer")
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+
+def test_disk_store_is_capped(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", memory_entries=1, disk_entries=3)
+    for i in range(5):
+        cache.set(f"k{i}", f"a{i}")
+    rows = cache._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    assert rows == 3
+    assert cache.get("k4") == "a4"
+
+
+def test_memory_only_cache():
+    cache = ResponseCache(path=None)
+    cache.set("k", "answer")
+    assert cache.get("k") == "answer"
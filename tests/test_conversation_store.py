@@ -0,0 +1,53 @@
+from src.conversation_store import ConversationStore
+
+
+def _fill(store, n, session="s"):
+    for i in range(n):
+        store.append(session, f"q{i}", f"r{i}", "short", "en")
+
+
+def test_pages_come_from_memory_and_disk(tmp_path):
+    store = ConversationStore(tmp_path / "c.sqlite", tail_turns=5)
+    _fill(store, 23)
+    assert store.count("s") == 23
+    assert [t["question"] for t in store.page("s", 0, 10)] == [f"q{i}" for i in range(10)]
+    assert [t["question"] for t in store.page("s", 2, 10)] == ["q20", "q21", "q22"]
+    assert store.page("s", 3, 10) == []
+    assert [t["question"] for t in store.recent("s")] == [f"q{i}" for i in range(18, 23)]
+
+
+def test_history_survives_a_restart(tmp_path):
+    _fill(ConversationStore(tmp_path / "c.sqlite"), 3)
+    store = ConversationStore(tmp_path / "c.sqlite")
+    assert store.count("s") == 3
+    assert store.append("s", "q3", "r3") == 4
+    assert "".join(store.transcript("s")).count("Q: ") == 4
+
+
+def test_sessions_are_separate(tmp_path):
+    store = ConversationStore(tmp_path / "c.sqlite")
+    _fill(store, 2, "a")
+    _fill(store, 1, "b")
+    assert store.count("a") == 2 and store.count("b") == 1
+    store.clear("a")
+    assert store.count("a") == 0 and store.count("b") == 1
+
+
+def test_memory_only_store():
+    store = ConversationStore(path=None, tail_turns=2)
+    _fill(store, 5)
+    assert [t["question"] for t in store.page("s", 1, 2)] == ["q2", "q3"]
+    assert "".join(store.transcript("s")).startswith("Q: q0")
+
+
+def test_append_and_pages_after_a_retention_purge(tmp_path):
+    store = ConversationStore(tmp_path / "c.sqlite", retention_days=1)
+    _fill(store, 6)
+    # The first three turns are past retention: purged when the store is reopened
+    store._db.execute("UPDATE turns SET created_at = 0 WHERE turn < 3")
+    store = ConversationStore(tmp_path / "c.sqlite", retention_days=1, tail_turns=2)
+    assert store.count("s") == 3
+    assert store.append("s", "q6", "r6") == 4
+    assert [t["question"] for t in store.page("s", 0, 2)] == ["q3", "q4"]
+    assert [t["question"] for t in store.page("s", 1, 2)] == ["q5", "q6"]
+    assert [t["question"] for t in store.iter_turns("s")] == ["q3", "q4", "q5", "q6"]
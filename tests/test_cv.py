@@ -0,0 +1,22 @@
+from src.cv import WRITTEN_SECTIONS, generate_cv
+
+
+def test_sections_are_written_from_their_profile_fields(fake_client, snapshot, monkeypatch):
+    sent = []
+    complete = fake_client.chat.complete
+
+    def spy(**kwargs):
+        sent.append(kwargs)
+        return complete(**kwargs)
+
+    monkeypatch.setattr(fake_client.chat, "complete", spy)
+    cv = "".join(generate_cv(lang="en"))
+    assert "## Skills" in cv and "## Experience" in cv and "## Education" in cv
+
+    system_prompts = {kwargs["max_tokens"]: kwargs["messages"][0]["content"] for kwargs in sent}
+    experience = system_prompts[WRITTEN_SECTIONS["experience"][3]]
+    for entry in snapshot.data["experience"]:
+        assert entry["title"] in experience
+    skills = system_prompts[WRITTEN_SECTIONS["skills"][3]]
+    assert '"skills"' in skills and '"skill_clusters"' in skills
+    assert '"experience"' not in skills
@@ -0,0 +1,33 @@
+import pytest
+
+from src.facts import classify, fact_answer
+
+
+def test_plain_fact_questions_are_classified():
+    assert classify("What is your email?") == "email"
+    assert classify("Quelles langues parlez-vous ?") == "languages"
+    assert classify("What is your email and phone number?") == "contact"
+
+
+def test_specific_questions_go_to_the_model():
+    assert classify("How did you use Python at IFM?") is None
+    assert classify("Would you be a good candidate for this data analyst role?") is None
+
+
+@pytest.mark.parametrize("question", [
+    "What languages do you code in?",
+    "Which languages do you program in?",
+    "Do you have Java skills?",
+    "What skills do you lack?",
+    "Can you live in Paris?",
+])
+def test_any_other_word_goes_to_the_model(question):
+    assert classify(question) is None
+
+
+def test_answers_come_from_the_profile(snapshot):
+    intent, answer = fact_answer("What is your email?", "en", snapshot)
+    assert intent == "email"
+    assert snapshot.data["contact"]["email"] in answer
+    intent, answer = fact_answer("Quelles langues parlez-vous ?", "fr", snapshot)
+    assert "français" in answer and "anglais" in answer
@@ -0,0 +1,32 @@
+from src.memory import ConversationMemory
+from src.utils import estimate_tokens
+
+
+def test_recent_turns_are_sent_as_messages():
+    memory = ConversationMemory()
+    memory.add("Hello?", "Hi.")
+    assert memory.messages() == [{"role": "user", "content": "Hello?"},
+                                 {"role": "assistant", "content": "Hi."}]
+    assert memory.summary_block() == ""
+
+
+def test_old_turns_are_folded_into_a_bounded_summary():
+    memory = ConversationMemory(token_budget=100, summary_budget=60)
+    for i in range(30):
+        memory.add(f"Question {i}?", f"Answer {i}. " + "More detail. " * 10)
+    recent = sum(estimate_tokens(m["content"]) for m in memory.messages())
+    assert recent <= 100
+    assert memory.summary_lines
+    assert estimate_tokens(memory.summary()) <= 60 or len(memory.summary_lines) == 1
+    assert "Question 29?" in memory.as_text()
+
+
+def test_round_trip_and_fingerprint():
+    memory = ConversationMemory()
+    assert memory.fingerprint() == ""
+    memory.add("Q1?", "A1.")
+    restored = ConversationMemory.from_dict(memory.to_dict())
+    assert restored.messages() == memory.messages()
+    assert restored.fingerprint() == memory.fingerprint()
+    restored.add("Q2?", "A2.")
+    assert restored.fingerprint() != memory.fingerprint()
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from src.rate_limiter import PRIORITY_BATCH, PRIORITY_INTERACTIVE, QueueFullError, RateLimiter
+from src.resilience import DeadlineExceeded
+
+
+def test_concurrency_is_capped():
+    limiter = RateLimiter(requests_per_minute=6000, max_concurrency=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def call():
+        with limiter.acquire():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+
+
+def test_interactive_requests_go_before_batch_ones():
+    limiter = RateLimiter(requests_per_minute=6000, max_concurrency=1)
+    order = []
+    release = threading.Event()
+
+    def hold():
+        with limiter.acquire():
+            release.wait()
+
+    def call(name, priority):
+        with limiter.acquire(priority=priority):
+            order.append(name)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.02)
+    batch = threading.Thread(target=call, args=("batch", PRIORITY_BATCH))
+    batch.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=call, args=("interactive", PRIORITY_INTERACTIVE))
+    interactive.start()
+    time.sleep(0.02)
+    release.set()
+    for thread in (holder, batch, interactive):
+        thread.join()
+    assert order == ["interactive", "batch"]
+
+
+def test_full_queue_fails_fast():
+    limiter = RateLimiter(requests_per_minute=6000, max_concurrency=1, max_queue=0)
+    with pytest.raises(QueueFullError):
+        with limiter.acquire():
+            pass
+
+
+def test_wait_is_bounded_by_timeout():
+    limiter = RateLimiter(requests_per_minute=6000, max_concurrency=1)
+    with limiter.acquire():
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            with limiter.acquire(timeout=0.05):
+                pass
+        assert time.monotonic() - started < 1
+    assert limiter.queued == 0
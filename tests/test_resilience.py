@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from src import resilience
+from src.resilience import CircuitBreaker, CircuitOpenError, Deadline, DeadlineExceeded, LatencyTracker
+
+
+def test_breaker_opens_on_error_rate_and_fails_fast():
+    breaker = CircuitBreaker(error_rate=0.5, window=10, min_calls=4, cooldown=60)
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.allow()  # 3 calls: below min_calls
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+
+def test_breaker_probe_closes_or_reopens():
+    breaker = CircuitBreaker(error_rate=0.5, window=10, min_calls=2, cooldown=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.allow()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()  # others wait while it runs
+    breaker.record_failure()
+    assert breaker.is_open
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.allow()
+
+
+def test_deadline():
+    deadline = Deadline(10)
+    assert 0 < deadline.timeout_ms("short") <= resilience.ATTEMPT_TIMEOUT["short"] * 1000
+    expired = Deadline(0)
+    with pytest.raises(DeadlineExceeded):
+        expired.check()
+    with pytest.raises(DeadlineExceeded):
+        expired.timeout_ms("short")
+
+
+def test_hedge_delay_needs_samples(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_ENABLED", True)
+    tracker = LatencyTracker()
+    assert tracker.hedge_delay("short") is None
+    for i in range(100):
+        tracker.observe("short", 1.0 + i / 100)
+    assert tracker.p95("short") == pytest.approx(1.94)
+    assert tracker.hedge_delay("short") == pytest.approx(1.94)
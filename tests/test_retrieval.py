@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from src import retrieval
+from src.retrieval import build_system_prompt, retrieve, tokenize
+
+
+def test_tokenize_strips_accents_and_stopwords():
+    assert tokenize("Quelle est votre expérience à l'École ?") == ["experience", "ecole"]
+
+
+def test_relevant_sections_are_retrieved(snapshot):
+    keys = [chunk.key for chunk, _ in retrieve("Which degree did you study at university?", snapshot=snapshot)]
+    assert keys[0] == "education"
+
+
+def test_employer_named_in_the_question_is_retrieved(snapshot):
+    top = retrieve("What did you do at Carrier?", snapshot=snapshot)[0][0]
+    assert top.key == "experience" and top.value["company"] == "Carrier HVAC"
+
+
+def test_prompt_has_core_fields_and_stays_within_budget(snapshot):
+    prompt = build_system_prompt("Tell me about your Power BI dashboards", snapshot=snapshot)
+    assert snapshot.data["name"] in prompt
+    assert len(prompt) < len(snapshot.context)
+
+
+def test_unmatched_question_gets_the_full_context(snapshot):
+    assert build_system_prompt("zzzz qqqq", snapshot=snapshot) == snapshot.context
+
+
+@pytest.mark.parametrize("question", [
+    "What is your most recent job?",
+    "Walk me through your work history",
+    "Summarize your career",
+    "Résumez votre parcours",
+])
+def test_broad_questions_get_the_full_context(snapshot, question):
+    assert build_system_prompt(question, snapshot=snapshot) == snapshot.context
+
+
+def test_weak_matches_get_the_full_context(snapshot, monkeypatch):
+    question = "Are you patient?"
+    assert build_system_prompt(question, snapshot=snapshot) != snapshot.context
+    monkeypatch.setattr(retrieval, "MIN_SCORE", retrieve(question, snapshot=snapshot)[0][1] + 0.1)
+    assert build_system_prompt(question, snapshot=snapshot) == snapshot.context
+
+
+def test_every_position_is_indexed(snapshot):
+    prompt = build_system_prompt("How did you build the top prospect model?", snapshot=snapshot)
+    assert '"experience_index"' in prompt
+    for entry in snapshot.data["experience"]:
+        assert json.dumps(entry["title"], ensure_ascii=False) in prompt
+    assert "IFM" in prompt and "2023 – Present" in prompt
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from src.routing import DEFAULT_ROUTES, ModelRouter
+
+
+def _router():
+    return ModelRouter({"short": ["a", "b"]}, {"short": 1.0}, demote_seconds=60)
+
+
+def test_server_errors_and_rate_limits_demote():
+    for status in (429, 503):
+        router = _router()
+        router.record_failure("short", "a", SimpleNamespace(status_code=status, headers={}))
+        assert router.candidates("short") == ["b", "a"]
+    router = _router()
+    router.record_failure("short", "a", TimeoutError("read timed out"))
+    assert router.candidates("short") == ["b", "a"]
+
+
+def test_client_errors_do_not_demote():
+    router = _router()
+    router.record_failure("short", "a", SimpleNamespace(status_code=400, headers={}))
+    assert router.candidates("short") == ["a", "b"]
+    assert router.status()["short"][0]["failures"] == 0
+
+
+def test_slow_average_demotes():
+    router = _router()
+    router.record_success("short", "a", 0.2)
+    assert router.candidates("short") == ["a", "b"]
+    for _ in range(5):
+        router.record_success("short", "a", 5.0)
+    assert router.candidates("short") == ["b", "a"]
+
+
+def test_empty_route_keeps_the_default_chain(monkeypatch, tmp_path):
+    config = tmp_path / "models.toml"
+    config.write_text('[routes]\nlong = []\n')
+    monkeypatch.setenv("MODEL_ROUTE_SHORT", " , ")
+    router = ModelRouter.from_config(config)
+    assert router.primary("short") == DEFAULT_ROUTES["short"][0]
+    assert router.primary("long") == DEFAULT_ROUTES["long"][0]
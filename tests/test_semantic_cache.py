@@ -0,0 +1,43 @@
+import pytest
+
+from src.semantic_cache import SemanticCache
+
+
+def test_rephrasing_reuses_the_answer(snapshot):
+    index = SemanticCache()
+    index.add("What are your main technical skills?", "skills answer", "en", "short", "m", snapshot)
+    assert index.lookup("what are your main technical skills", "en", "short", "m", snapshot) == "skills answer"
+
+
+def test_partitions_are_separate(snapshot):
+    index = SemanticCache()
+    index.add("What are your main technical skills?", "skills answer", "en", "short", "m", snapshot)
+    assert index.lookup("What are your main technical skills?", "fr", "short", "m", snapshot) is None
+    assert index.lookup("What are your main technical skills?", "en", "long", "m", snapshot) is None
+    assert index.lookup("What are your main technical skills?", "en", "short", "other", snapshot) is None
+
+
+def test_unrelated_question_misses(snapshot):
+    index = SemanticCache()
+    index.add("What are your main technical skills?", "skills answer", "en", "short", "m", snapshot)
+    assert index.lookup("Where did you study?", "en", "short", "m", snapshot) is None
+
+
+def test_example_rephrasing_reuses_the_answer(snapshot):
+    index = SemanticCache()
+    index.add("Can you describe how you built the Top Prospect Model at IFM and the measurable impact it had?",
+              "prospect answer", "en", "short", "m", snapshot)
+    assert index.lookup("How did you build the Top Prospect Model at IFM, and what was its impact?",
+                        "en", "short", "m", snapshot) == "prospect answer"
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("What is your experience with Python?", "What is your experience with SQL?"),
+    ("What is your experience with Python?", "What is your experience with Excel?"),
+    ("How did you use Power BI at IFM?", "How did you use Power BI at Lidl?"),
+    ("Would you be a good fit for a data analyst role?", "Would you be a good fit for a data engineer role?"),
+])
+def test_other_tool_company_or_role_misses(snapshot, stored, asked):
+    index = SemanticCache(threshold=0.0)
+    index.add(stored, "stored answer", "en", "short", "m", snapshot)
+    assert index.lookup(asked, "en", "short", "m", snapshot) is None
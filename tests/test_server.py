@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("starlette")  # optional [server] dependency
+from starlette.testclient import TestClient  # noqa: E402
+
+from src.server import app  # noqa: E402
+
+
+@pytest.mark.parametrize("body", [
+    {"question": "What are your skills?", "mode": ["a"]},
+    {"question": "What are your skills?", "mode": "verbose"},
+    {"question": "What are your skills?", "lang": ["en"]},
+    {"question": "  "},
+    {"question": "What are your skills?", "memory": []},
+    {"question": "What are your skills?", "memory": {"turns": 5}},
+    {"question": "What are your skills?", "memory": {"turns": [["only a question"]]}},
+    {"question": "What are your skills?", "profile_keys": "skills"},
+    {"question": "What are your skills?", "max_tokens": 0},
+    {"question": "What are your skills?", "max_tokens": True},
+])
+def test_invalid_body_is_rejected(fake_client, body):
+    response = TestClient(app).post("/ask", json=body)
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+def test_ask_answers(fake_client):
+    response = TestClient(app).post("/ask", json={"question": "What are your skills?", "mode": "long", "lang": "en"})
+    assert response.status_code == 200
+    assert response.json()["answer"]
@@ -1,4 +1,6 @@
 import sys
+import uuid
+from functools import partial
 from pathlib import Path
 import streamlit as st
 
@@ -7,46 +9,55 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from src.agent import ask_agent
-from src.profile_loader import load_profile
+from src.agent import ask_agent_stream
+from src.cv import generate_cv
+from src.remote import AGENT_API_URL, remote_ask_stream
+from src.answer_store import get_answer_store
+from src.conversation_store import get_conversation_store
+from src.instrumentation import serve_metrics_from_env, span
+from src.memory import ConversationMemory
+from src.profile_loader import get_profile
+from src.questions import EXAMPLE_QUESTIONS
 from web.components import (
+    DEFAULT_NAME,
     render_profile_card,
     render_title,
     render_language_selector,
     render_footer,
     display_response,
     render_cv_generator,
+    profile_labels,
     _labels
 )
 
-# Example questions database
-EXAMPLE_QUESTIONS = {
-    "English": [
-        "Can you describe how you built the Top Prospect Model at IFM and the measurable impact it had?",
-        "How did you enrich CRM data with public sources and what business value did it unlock?",
-        "What is your Profit Threshold Credit Approval Model and how does it differ from traditional ML approaches?",
-        "How have you automated processes in your roles (e.g., pricing, reporting, marketing) and what time savings did you achieve?",
-        "Can you explain the Personal AI Agent project and how it demonstrates your skills in LLM integration?",
-        "What innovative projects have you done outside of work, such as healthcare or education-related automation?",
-        "How have you influenced C-level decision-making through analytics and dashboards?"
-    ],
-    "Français": [
-        "Pouvez-vous décrire comment vous avez construit le modèle de prospection chez IFM et son impact mesurable ?",
-        "Comment avez-vous enrichi le CRM avec des données publiques et quelle valeur business cela a-t-il généré ?",
-        "Qu’est-ce que votre modèle d’approbation de crédit basé sur le seuil de rentabilité et en quoi diffère-t-il des approches classiques ?",
-        "Comment avez-vous automatisé des processus (prix, reporting, marketing) et quels gains de temps concrets avez-vous obtenus ?",
-        "Pouvez-vous expliquer le projet Agent Personnel IA et en quoi il démontre vos compétences en intégration LLM ?",
-        "Quels projets innovants avez-vous réalisés en dehors du travail, comme l’automatisation dans la santé ou l’éducation ?",
-        "Comment vos analyses ont-elles influencé des décisions stratégiques au niveau de la direction générale ?"
-    ]
-}
-
-
-# Initialize session state
-if "history" not in st.session_state:
-    st.session_state.history = []
-
-def render_question_form(labels: dict, on_submit) -> str:
+
+# Thin client of the HTTP API (src/server.py) when AGENT_API_URL is set
+if AGENT_API_URL:
+    ask_agent_stream = remote_ask_stream
+    generate_cv = partial(generate_cv, ask=lambda prompt, **kwargs: "".join(remote_ask_stream(prompt, **kwargs)))
+
+# Turns shown per page of the conversation history
+HISTORY_PAGE_SIZE = 10
+
+
+def init_session() -> str:
+    """
+    Conversation id of this browser tab, kept in the URL (?session=...) so the
+    stored history survives a dropped connection; a resumed conversation gets
+    its recent turns back as memory. The id is the only access check: whoever
+    has the link can read the conversation (see the README's Security section).
+    """
+    session_id = st.query_params.get("session")
+    if not session_id or len(session_id) != 32 or not session_id.isalnum():
+        session_id = uuid.uuid4().hex
+        st.query_params["session"] = session_id
+    if "memory" not in st.session_state:
+        st.session_state.memory = ConversationMemory()
+        for turn in get_conversation_store().recent(session_id):
+            st.session_state.memory.add(turn["question"], turn["response"])
+    return session_id
+
+def render_question_form(labels: dict, on_submit):
     """Render the question input form"""
     with st.form(key="question_form"):
         question = st.text_area(
@@ -60,7 +71,7 @@ def render_question_form(labels: dict, on_submit) -> str:
             return on_submit(question)
     return None
 
-def render_example_questions(labels: dict, questions: dict, lang: str, on_submit) -> str:
+def render_example_questions(labels: dict, questions: dict, lang: str, on_submit):
     """Render example questions with radio buttons"""
     st.markdown(labels["example_header"])
     
@@ -76,94 +87,120 @@ def render_example_questions(labels: dict, questions: dict, lang: str, on_submit
         return on_submit(selected)
     return None
 
-def render_conversation_history(history: list, labels: dict):
-    """Render conversation history chronologically"""
-    if not history:
+def render_conversation_history(session_id: str, labels: dict):
+    """Render one page of the stored conversation history (newest page by default)"""
+    store = get_conversation_store()
+    count = store.count(session_id)
+    if not count:
         return
-    
-    st.markdown("### Previous Conversations")
-    
-    for i, entry in enumerate(history):
-        with st.expander(f"Q{i+1}: {entry['question'][:100]}...", expanded=False):
+
+    st.markdown("### " + labels["history_header"])
+
+    pages = (count + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+    page = pages
+    if pages > 1:
+        page = int(st.number_input(labels["history_page"], min_value=1, max_value=pages, value=pages, step=1))
+    first = (page - 1) * HISTORY_PAGE_SIZE
+    for i, entry in enumerate(store.page(session_id, page - 1, HISTORY_PAGE_SIZE), start=first + 1):
+        with st.expander(f"Q{i}: {entry['question'][:100]}...", expanded=False):
             st.markdown("**Question:**")
             st.markdown(entry['question'])
             st.markdown("**Response:**")
             st.markdown(entry['response'])
             st.markdown(f"*Mode: {entry['mode']} | Language: {entry['lang']}*")
-    
-    # Add download button
-    conversation_text = "\n\n".join([
-        f"Q: {turn['question']}\nA: {turn['response']}"
-        for turn in history
-    ])
-    st.download_button(
-        labels["download_transcript"],
-        data=conversation_text,
-        file_name="conversation.txt",
-        mime="text/plain"
-    )
+
+    # The transcript is only built when asked for
+    if st.button(labels["prepare_transcript"], key="prepare_transcript"):
+        st.download_button(
+            labels["download_transcript"],
+            data="".join(store.transcript(session_id)),
+            file_name="conversation.txt",
+            mime="text/plain"
+        )
 
 def main():
+    # Prometheus /metrics endpoint when AGENT_METRICS=1 and AGENT_METRICS_PORT are set (started once)
+    serve_metrics_from_env()
+    # Precomputed answers to the curated questions (loaded once per process)
+    get_answer_store()
+
     # Language and mode selection
     lang, mode = render_language_selector()
     
+    # Candidate selected with ?profile=<id> (one of PROFILES_DIR), default profile otherwise.
+    # Shared profile (parsed once per process, reloaded when its file changes)
+    profile_id = st.query_params.get("profile")
+    try:
+        profile = get_profile(profile_id)
+    except (ValueError, OSError):
+        st.error(f"Unknown profile: {profile_id}")
+        st.stop()
+    ask = partial(ask_agent_stream, profile_id=profile_id)
+
     # Get localized labels
-    labels = _labels(lang)
-    
+    labels = profile_labels(_labels(lang), profile)
+    name = profile.get("name") or DEFAULT_NAME
+
     # Page configuration
     st.set_page_config(
-        page_title=f"Julien Vaughan — {labels['title']}",
+        page_title=f"{name} — {labels['title']}",
         layout="wide",
         initial_sidebar_state="expanded"
     )
+    session_id = init_session()
 
     # Render title + description (introduction)
     render_title(labels)  # this should include the title
 
-    # Load profile and sidebar
-    profile = load_profile()
     with st.sidebar:
-        render_cv_generator(labels, ask_agent)
+        # CV sections are generated concurrently, queued behind interactive questions
+        render_cv_generator(labels, partial(generate_cv, lang=lang, profile_id=profile_id), name)
         if profile:
             render_profile_card(profile, lang, expanded=False)
 
-    # Callback for question submission
-    def handle_question(question: str) -> str:
-        with st.spinner(labels["spinner_thinking"]):
-            response = ask_agent(question, mode=mode)
-            if response:
-                st.session_state.history.append({
-                    "question": question,
-                    "response": response,
-                    "mode": mode,
-                    "lang": lang,
-                    "timestamp": st.session_state.get("_current_time", "")
-                })
-            return response
+    # Callbacks for question submission: the answer is streamed when displayed.
+    # The UI language is known, so the agent skips language detection.
+    # Free questions may follow up on earlier turns and get the conversation memory;
+    # example questions are self-contained, so their answers stay shareable in the cache.
+    def handle_free_question(question: str):
+        return question, ask(question, mode=mode, lang=lang, memory=st.session_state.memory)
+
+    def handle_example_question(question: str):
+        return question, ask(question, mode=mode, lang=lang)
 
     # Main layout (remove redundant title)
     col1, col2 = st.columns([1, 2.5])
     
     with col1:
         st.markdown(labels["free_question_header"])
-        response = render_question_form(labels, handle_question)
+        free_submission = render_question_form(labels, handle_free_question)
     
     with col2:
-        example_response = render_example_questions(
+        example_submission = render_example_questions(
             labels,
             EXAMPLE_QUESTIONS,
             lang,
-            handle_question
+            handle_example_question
         )
     
     # Display current response
-    response = response or example_response
-    if response:
+    submitted = free_submission or example_submission
+    if submitted:
+        question, stream = submitted
         st.markdown("### Current Response")
-        display_response(response, agent_label=labels["agent"], as_markdown=True)
+        try:
+            # Includes the streaming time: the answer is rendered as it arrives
+            with span("render", mode=mode):
+                response = display_response(stream, agent_label=labels["agent"], as_markdown=True)
+        except RuntimeError as e:  # API overloaded or request queue full
+            st.error(str(e))
+            response = None
+        if response:
+            st.session_state.memory.add(question, response)
+            get_conversation_store().append(session_id, question, response, mode=mode, lang=lang)
     
     # Conversation history
-    render_conversation_history(st.session_state.history, labels)
+    render_conversation_history(session_id, labels)
     
     # Footer
     render_footer()
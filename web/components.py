@@ -4,11 +4,15 @@ Refactored UI components for the Streamlit agent.
 This module focuses purely on presentation and small UI helpers.
 Keep translations here so app.py stays very small.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Union
 from pathlib import Path
 import streamlit as st
 
 
+# Candidate the built-in texts below are written for
+DEFAULT_NAME = "Julien Vaughan"
+
+
 def _labels(lang: str = "English") -> Dict[str, str]:
     return {
         "English": {
@@ -18,6 +22,9 @@ def _labels(lang: str = "English") -> Dict[str, str]:
             "contact": "Contact",
             "view_raw": "View raw profile (JSON)",
             "download_transcript": "Download conversation",
+            "prepare_transcript": "Export conversation",
+            "history_header": "Previous Conversations",
+            "history_page": "Page",
             "no_profile": "No profile data available",
             "agent": "Agent",
             "free_question_header": "Ask a free question, for example: ‘Would you be a good candidate for this role?’ (Paste your job description).",
@@ -50,6 +57,9 @@ def _labels(lang: str = "English") -> Dict[str, str]:
             "contact": "Contact",
             "view_raw": "Voir le profil brut (JSON)",
             "download_transcript": "Télécharger la conversation",
+            "prepare_transcript": "Exporter la conversation",
+            "history_header": "Conversations précédentes",
+            "history_page": "Page",
             "no_profile": "Aucune donnée de profil disponible",
             "agent": "Agent",
             "free_question_header": "Posez une question libre, par exemple, 'Seriez-vous un bon candidat pour ce poste ?' (Collez votre fiche de poste).",
@@ -77,6 +87,18 @@ def _labels(lang: str = "English") -> Dict[str, str]:
     }[lang]
 
 
+def profile_labels(labels: Dict[str, str], profile: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Labels for another candidate: their name in the title and their summary as introduction"""
+    name = (profile or {}).get("name")
+    if not name or name == DEFAULT_NAME:
+        return labels
+    return {
+        **labels,
+        "title": labels["title"].replace(DEFAULT_NAME, name),
+        "about_me_text": profile.get("summary", ""),
+    }
+
+
 def render_profile_card(profile: Optional[Dict[str, Any]], lang: str = "English", expanded: bool = True) -> None:
     """Render a compact, recruiter-friendly profile card.
     Optimized for sidebar display with single column layout.
@@ -114,25 +136,32 @@ def render_title(labels: dict):
     st.markdown(labels["about_me_text"])
     st.markdown("---")
 
-def display_response(response: str, agent_label: Optional[str] = None, as_markdown: bool = True, expanded: bool = True) -> None:
+def display_response(response: Union[str, Iterable[str]], agent_label: Optional[str] = None, as_markdown: bool = True, expanded: bool = True) -> str:
     """Display the agent response in a readable container.
 
     - If expanded: show inside an expander with the agent label.
     - If not expanded: show inline with a small header.
+    - A streamed response (iterable of chunks) is rendered as it arrives.
+    Returns the full response text.
     """
     label = agent_label or _labels()["agent"]
     if expanded:
         with st.expander(label, expanded=True):
-            if as_markdown:
-                st.markdown(response)
-            else:
-                st.text(response)
-    else:
-        st.subheader(label)
+            return _write_response(response, as_markdown)
+    st.subheader(label)
+    return _write_response(response, as_markdown)
+
+
+def _write_response(response: Union[str, Iterable[str]], as_markdown: bool) -> str:
+    if not isinstance(response, str):
         if as_markdown:
-            st.markdown(response)
-        else:
-            st.text(response)
+            return st.write_stream(response)
+        response = "".join(response)
+    if as_markdown:
+        st.markdown(response)
+    else:
+        st.text(response)
+    return response
 
 
 def transcript_download_button(text: str, filename: str = "conversation.txt", label: Optional[str] = None) -> None:
@@ -205,46 +234,32 @@ def render_conversation_history(conversation: list, lang: str):
     )
     
 
-def render_cv_generator(labels: dict, ask_agent):
-    """Render a button to generate a CV and show/download it once generated."""
-
-    # Build extra context from conversation history
-    history_text = ""
-    if "history" in st.session_state and st.session_state.history:
-        qa_pairs = [
-            f"Q: {turn['question']}\nA: {turn['response']}"
-            for turn in st.session_state.history
-        ]
-        history_text = "\n\n".join(qa_pairs)
+def render_cv_generator(labels: dict, generate_cv, name: str = DEFAULT_NAME):
+    """Render a button to generate a CV, streaming it in section by section, and show/download it once generated."""
 
     # Button trigger
     if st.button(labels["generate_cv"], key="generate_cv"):
-        with st.spinner(labels["spinner_thinking"]):
-            cv_prompt = (
-                "Using Julien Vaughan's profile, generate a professional, "
-                "concise, chronological CV suitable for recruiters. "
-                "Format sections as: Contact, Skills, Experience (with achievements), "
-                "Education, Languages. Keep it in clean Markdown.\n\n"
-            )
-            if history_text:
-                cv_prompt += (
-                    "Here are example questions and responses from recent interactions. "
-                    "Incorporate relevant elements where appropriate:\n\n"
-                    f"{history_text}"
-                )
-            cv_text = ask_agent(cv_prompt, mode="long")
-            if cv_text:
-                st.session_state.cv_text = cv_text
-                st.success(labels["generate_cv"] + " ✅")
+        st.markdown("### " + labels["generate_cv"])
+        try:
+            # Compact conversation memory (summary + recent turns), not the raw transcript
+            cv_text = st.write_stream(generate_cv(memory=st.session_state.get("memory")))
+        except RuntimeError as e:  # API overloaded or request queue full
+            st.error(str(e))
+            cv_text = None
+        if cv_text:
+            st.session_state.cv_text = cv_text
+            st.success(labels["generate_cv"] + " ✅")
 
-    # Display generated CV
-    if "cv_text" in st.session_state:
+    # Display previously generated CV
+    elif "cv_text" in st.session_state:
         st.markdown("### " + labels["generate_cv"])
         st.markdown(st.session_state.cv_text)
+
+    if "cv_text" in st.session_state:
         st.download_button(
             "⬇️ " + labels["generate_cv"],
             data=st.session_state.cv_text,
-            file_name="Julien_Vaughan_CV.md",
+            file_name=f"{name.replace(' ', '_')}_CV.md",
             mime="text/markdown"
         )
 